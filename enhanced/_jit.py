@@ -0,0 +1,283 @@
+"""
+Numba-compiled numeric kernels for the signal and training hot paths.
+
+Kernels operate on flat NumPy arrays only. When Numba is not installed
+they run as plain Python with identical results.
+
+The training kernels carry explicit signatures, so they compile when
+this module is imported rather than on first call, and the on-disk
+cache then serves every later import. Their array arguments must be
+C-contiguous in the declared dtypes.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import config as numba_config
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not installed, using pure-Python kernels")
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit``."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
+
+
+def _threadsafe_layer_available() -> bool:
+    """Whether Numba has a threading layer safe to enter from many threads.
+    
+    Training calls parallel kernels from several threads at once, which
+    only the TBB and OpenMP layers support; the fallback workqueue layer
+    aborts the process.
+    """
+    if not NUMBA_AVAILABLE:
+        return False
+    for module in ('numba.np.ufunc.omppool', 'numba.np.ufunc.tbbpool'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+# Row-parallel kernels only run in parallel on a thread-safe layer
+PARALLEL = _threadsafe_layer_available()
+if PARALLEL:
+    # Prefer OpenMP: TBB can hang at interpreter exit once executor
+    # threads have entered it
+    numba_config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+
+
+@njit(cache=True, fastmath=True)
+def weighted_predict(table: np.ndarray, distances: np.ndarray):
+    """Accumulate distance- and success-weighted next-candle changes.
+    
+    Args:
+        table: Rows of ``PatternMemory.prediction_table()`` for the matches,
+            as [base_weight, next_close, next_high, next_low]
+        distances: Distance of each pattern from the query
+        
+    Returns:
+        Tuple of (weighted_close, weighted_high, weighted_low, weight_sum)
+    """
+    weighted_close = 0.0
+    weighted_high = 0.0
+    weighted_low = 0.0
+    weight_sum = 0.0
+    
+    for i in range(table.shape[0]):
+        # Weight decays with distance; base_weight already holds the
+        # pattern weight times (1 + success rate)
+        weight = table[i, 0] / (1.0 + distances[i])
+        
+        weighted_close += table[i, 1] * weight
+        weighted_high += table[i, 2] * weight
+        weighted_low += table[i, 3] * weight
+        weight_sum += weight
+    
+    return weighted_close, weighted_high, weighted_low, weight_sum
+
+
+@njit(cache=True)
+def trailing_stop_check(
+    current_price: float,
+    peak: float,
+    pnl_pct: float,
+    start_pm: float,
+    gap_frac: float
+):
+    """Advance a trailing peak and test the trailing stop.
+    
+    Args:
+        current_price: Current market price
+        peak: Highest price seen so far, NaN if none yet
+        pnl_pct: Unrealized profit (%) of the position
+        start_pm: Profit (%) the position must reach before trailing
+        gap_frac: Stop as a fraction of the peak (1 - gap %)
+        
+    Returns:
+        Tuple of (new_peak, trailing_stop, hit)
+    """
+    if not peak >= current_price:  # also true while unset (NaN)
+        peak = current_price
+    trailing_stop = peak * gap_frac
+    hit = pnl_pct >= start_pm and current_price <= trailing_stop
+    return peak, trailing_stop, hit
+
+
+@njit(cache=True)
+def position_size(
+    account_value: float,
+    base_pct: float,
+    max_frac: float,
+    multiplier: float
+) -> float:
+    """Size an order from account value within the risk limits.
+    
+    Args:
+        account_value: Total account value
+        base_pct: Base allocation as a fraction of account value
+        max_frac: Largest position as a fraction of account value
+        multiplier: DCA size multiplier (1.0 for entries)
+        
+    Returns:
+        Dollar amount to invest, at least 1.0
+    """
+    size = min(account_value * base_pct * multiplier, account_value * max_frac)
+    return max(size, 1.0)
+
+
+@njit(
+    'UniTuple(f8[::1], 3)(f8[::1], f8[::1], f8[::1], i8, i8)',
+    cache=True, fastmath=True, nogil=True
+)
+def extract_changes(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    start: int,
+    lookback: int
+):
+    """Percentage changes between consecutive candles of one window.
+    
+    Args:
+        close: Close prices, newest first
+        high: High prices, newest first
+        low: Low prices, newest first
+        start: Index of the window's newest candle
+        lookback: Number of changes to compute
+        
+    Returns:
+        Tuple of (close_changes, high_changes, low_changes), newest first
+    """
+    close_changes = np.empty(lookback)
+    high_changes = np.empty(lookback)
+    low_changes = np.empty(lookback)
+    
+    for k in range(lookback):
+        i = start + k
+        close_changes[k] = (close[i] - close[i + 1]) / close[i + 1] * 100.0
+        high_changes[k] = (high[i] - high[i + 1]) / high[i + 1] * 100.0
+        low_changes[k] = (low[i] - low[i + 1]) / low[i + 1] * 100.0
+    
+    return close_changes, high_changes, low_changes
+
+
+@njit(
+    'f8[::1](f4[:, ::1], f8[::1], f8[::1], f8)',
+    cache=True, fastmath=True, nogil=True, parallel=PARALLEL
+)
+def row_distances(
+    changes: np.ndarray,
+    query: np.ndarray,
+    inv_scale: np.ndarray,
+    tolerance: float
+) -> np.ndarray:
+    """Sum of squared percentage differences of every row from the query.
+    
+    Rows are independent and split across threads. A row is abandoned
+    as soon as its running sum shows it is beyond tolerance; its partial
+    sum is still beyond tolerance when converted to a distance.
+    
+    Args:
+        changes: (rows, length) change vectors of the stored patterns
+        query: Change vector to match
+        inv_scale: 100 / |query| per element (0 where the query is 0)
+        tolerance: Maximum distance of interest
+        
+    Returns:
+        Sum of squares per row (partial for abandoned rows)
+    """
+    n, length = changes.shape
+    # Slack so early abandoning never drops a row the exact test keeps
+    cutoff = tolerance * tolerance * length * (1.0 + 1e-6) + 1e-12
+    totals = np.empty(n)
+    
+    for row in prange(n):
+        total = 0.0
+        for j in range(length):
+            diff = abs(changes[row, j] - query[j]) * inv_scale[j]
+            total += diff * diff
+            if total > cutoff:
+                break
+        totals[row] = total
+    
+    return totals
+
+
+@njit(
+    'Tuple((f8, i8[::1]))(f4[:, ::1], f8[::1], f8[::1], f8, i8)',
+    cache=True, fastmath=True, nogil=True
+)
+def top_k_predict(
+    changes: np.ndarray,
+    weights: np.ndarray,
+    totals: np.ndarray,
+    tolerance: float,
+    k: int
+):
+    """Find the k most similar patterns and their weighted prediction.
+    
+    Distance is the RMS of each element's percentage difference from the
+    query, as in ``PatternMemory.find_similar``.
+    
+    Args:
+        changes: (rows, length) change vectors of the stored patterns
+        weights: Weight of each stored pattern
+        totals: ``row_distances`` of the query against ``changes``
+        tolerance: Maximum distance to count as a match
+        k: Number of matches to keep
+        
+    Returns:
+        Tuple of (predicted_change, rows) where rows holds up to k
+        matches, most similar first (ties by row); predicted_change is
+        the distance-weighted mean of their next close change, 0.0 if
+        none match or the weights don't sum positive
+    """
+    n, length = changes.shape
+    top_rows = np.empty(k, dtype=np.int64)
+    top_dist = np.empty(k)
+    count = 0
+    
+    for row in range(n):
+        dist = np.sqrt(totals[row] / length)
+        if dist > tolerance:
+            continue
+        if count == k and dist >= top_dist[k - 1]:
+            continue
+        
+        # Insert into the sorted buffer; rows arrive in order, so equal
+        # distances stay ordered by row
+        pos = count if count < k else k - 1
+        while pos > 0 and top_dist[pos - 1] > dist:
+            top_dist[pos] = top_dist[pos - 1]
+            top_rows[pos] = top_rows[pos - 1]
+            pos -= 1
+        top_dist[pos] = dist
+        top_rows[pos] = row
+        if count < k:
+            count += 1
+    
+    weighted_sum = 0.0
+    weight_sum = 0.0
+    for i in range(count):
+        row = top_rows[i]
+        weight = weights[row] / (1.0 + top_dist[i])
+        weighted_sum += changes[row, 0] * weight
+        weight_sum += weight
+    
+    predicted = weighted_sum / weight_sum if weight_sum > 0 else 0.0
+    return predicted, top_rows[:count]
@@ -3,23 +3,33 @@ FastAPI server for PowerTrader Enhanced.
 
 Provides REST and WebSocket endpoints for monitoring and control.
 """
+import asyncio
 import logging
+import os
+import time
 from datetime import datetime
-from typing import Dict, List
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
+import msgspec
+import orjson
+import redis.asyncio as aioredis
 from fastapi import FastAPI, WebSocket, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from watchdog.observers import Observer
 
 from config import get_settings
 from models import ComponentStatus, HealthCheck, SystemStatus
+from signal_watch import LONG_SIGNAL_FILE, SHORT_SIGNAL_FILE, SIGNAL_FILES, SignalFileHandler
 
 # Initialize
 settings = get_settings()
 app = FastAPI(
     title="PowerTrader Enhanced API",
     version="2.0.0",
-    description="Professional crypto trading system with neural networks"
+    description="Professional crypto trading system with neural networks",
+    default_response_class=ORJSONResponse
 )
 
 # CORS
@@ -33,6 +43,21 @@ app.add_middleware(
 
 logger = logging.getLogger(__name__)
 
+# Derived from settings once; the configuration doesn't change while serving
+_coins: Tuple[str, ...] = tuple(settings.trading.coins)
+_coin_dirs: Dict[str, Path] = {coin: settings.get_coin_dir(coin) for coin in _coins}
+_timeframe_values: Tuple[str, ...] = tuple(tf.value for tf in settings.trading.timeframes)
+
+# Parsed contents of polled state files, keyed by path: (mtime_ns, size, value)
+_file_cache: Dict[Path, Tuple[int, int, Any]] = {}
+
+# Shared across workers; entries expire quickly so polled reads stay fresh
+_SIGNALS_CACHE_KEY = "signals:v1"
+_SIGNALS_CACHE_TTL_MS = 500
+
+# Monotonic time before which Redis is skipped after a failed command
+_redis_retry_at = 0.0
+
 
 # ============================================================================
 # HEALTH & STATUS
@@ -42,6 +67,7 @@ logger = logging.getLogger(__name__)
 async def health_check():
     """Health check endpoint."""
     components = {}
+    now = datetime.now()
     
     # Check database
     try:
@@ -49,14 +75,14 @@ async def health_check():
         components['database'] = HealthCheck(
             component='database',
             status=ComponentStatus.HEALTHY,
-            timestamp=datetime.now(),
+            timestamp=now,
             message='Connected'
         )
     except Exception as e:
         components['database'] = HealthCheck(
             component='database',
             status=ComponentStatus.UNHEALTHY,
-            timestamp=datetime.now(),
+            timestamp=now,
             message=str(e)
         )
     
@@ -66,26 +92,26 @@ async def health_check():
         components['redis'] = HealthCheck(
             component='redis',
             status=ComponentStatus.HEALTHY,
-            timestamp=datetime.now(),
+            timestamp=now,
             message='Connected'
         )
     except Exception as e:
         components['redis'] = HealthCheck(
             component='redis',
             status=ComponentStatus.UNHEALTHY,
-            timestamp=datetime.now(),
+            timestamp=now,
             message=str(e)
         )
     
     status = SystemStatus(
-        timestamp=datetime.now(),
+        timestamp=now,
         trading_mode=settings.trading_mode.value,
         is_trading=True,
         components=components,
         uptime_seconds=0.0  # TODO: Track actual uptime
     )
     
-    return status
+    return Response(content=msgspec.json.encode(status), media_type="application/json")
 
 
 @app.get("/api/status")
@@ -94,8 +120,8 @@ async def get_status():
     return {
         'trading_mode': settings.trading_mode.value,
         'exchange': settings.exchange.value,
-        'coins': settings.trading.coins,
-        'timeframes': [tf.value for tf in settings.trading.timeframes],
+        'coins': _coins,
+        'timeframes': _timeframe_values,
         'risk_limits': {
             'max_position_size_pct': settings.risk.max_position_size_pct,
             'max_daily_loss_pct': settings.risk.max_daily_loss_pct,
@@ -171,26 +197,183 @@ async def cancel_order(order_id: str):
 # SIGNALS & PREDICTIONS
 # ============================================================================
 
+def _read_small(path: Path) -> Optional[bytes]:
+    """Read a tiny state file with raw OS calls.
+    
+    Signal and timestamp files hold a few bytes, so a single ``os.read``
+    is cheaper than going through a buffered text stream and codec (or
+    a thread-pool hop).
+    
+    Args:
+        path: File to read
+        
+    Returns:
+        Stripped file contents, or None if the file does not exist
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        return os.read(fd, 64).strip()
+    finally:
+        os.close(fd)
+
+
+def _read_cached(
+    path: Path,
+    parse: Callable[[bytes], Any],
+    st: Optional[os.stat_result] = None
+) -> Any:
+    """Read and parse a small file, reusing the last result if unchanged.
+    
+    A single stat is issued per call (or none, if the caller already has
+    one); the file is only re-read and re-parsed when its mtime or size
+    differs from the cached entry.
+    
+    Args:
+        path: File to read
+        parse: Converts the stripped file contents to a value (``int``
+            and ``float`` accept bytes directly)
+        st: Stat result for ``path`` if already known
+        
+    Returns:
+        Parsed value, or None if the file does not exist
+    """
+    if st is None:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            _file_cache.pop(path, None)
+            return None
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _file_cache.get(path)
+    if cached is not None and cached[:2] == key:
+        return cached[2]
+    
+    data = _read_small(path)
+    if data is None:
+        return None
+    
+    value = parse(data)
+    _file_cache[path] = (*key, value)
+    return value
+
+
+def _read_signal_pair(coin: str) -> Optional[Tuple[str, int, int]]:
+    """Read the long/short signal files for a coin.
+    
+    Args:
+        coin: Coin symbol
+        
+    Returns:
+        Tuple of (coin, long_strength, short_strength), or None if either
+        signal file is missing
+    """
+    coin_dir = _coin_dirs[coin]
+    
+    # One directory scan confirms both files and yields their stat results
+    try:
+        with os.scandir(coin_dir) as it:
+            entries = {e.name: e for e in it if e.name in SIGNAL_FILES}
+    except FileNotFoundError:
+        return None
+    
+    if len(entries) < len(SIGNAL_FILES):
+        return None
+    
+    long_entry = entries[LONG_SIGNAL_FILE]
+    short_entry = entries[SHORT_SIGNAL_FILE]
+    
+    long_strength = _read_cached(Path(long_entry.path), int, long_entry.stat())
+    short_strength = _read_cached(Path(short_entry.path), int, short_entry.stat())
+    
+    if long_strength is None or short_strength is None:
+        return None
+    
+    return coin, long_strength, short_strength
+
+
+def _collect_signals() -> Dict[str, Dict]:
+    """Read current trading signals for all coins from their signal files.
+    
+    Returns:
+        Dictionary of signal data by coin
+    """
+    signals = {}
+    timestamp = datetime.now().isoformat()
+    
+    for coin in _coins:
+        try:
+            result = _read_signal_pair(coin)
+        except Exception as e:
+            logger.error(f"Error reading signals for {coin}: {e}")
+            continue
+        if result is None:
+            continue
+        
+        _, long_strength, short_strength = result
+        signals[coin] = {
+            'long_strength': long_strength,
+            'short_strength': short_strength,
+            'timestamp': timestamp
+        }
+    
+    return signals
+
+
+def _cache_client() -> Optional[aioredis.Redis]:
+    """Get the Redis client for the shared cache.
+    
+    Returns:
+        Redis client, or None if Redis is disabled or backing off after
+        a failure
+    """
+    redis = getattr(app.state, 'redis', None)
+    if redis is None or time.monotonic() < _redis_retry_at:
+        return None
+    return redis
+
+
+def _cache_failed(action: str, error: Exception) -> None:
+    """Log a failed Redis command and skip Redis for the retry window.
+    
+    Args:
+        action: What failed, for the log
+        error: The exception raised
+    """
+    global _redis_retry_at
+    retry_seconds = settings.redis.retry_seconds
+    _redis_retry_at = time.monotonic() + retry_seconds
+    logger.warning(f"Redis {action} failed, skipping cache for {retry_seconds:.0f}s: {error}")
+
+
 @app.get("/api/signals")
 async def get_signals():
     """Get current trading signals for all coins."""
-    signals = {}
+    redis = _cache_client()
     
-    for coin in settings.trading.coins:
+    if redis is not None:
         try:
-            coin_dir = settings.get_coin_dir(coin)
-            
-            long_file = coin_dir / "long_dca_signal.txt"
-            short_file = coin_dir / "short_dca_signal.txt"
-            
-            if long_file.exists() and short_file.exists():
-                signals[coin] = {
-                    'long_strength': int(long_file.read_text().strip()),
-                    'short_strength': int(short_file.read_text().strip()),
-                    'timestamp': datetime.now().isoformat()
-                }
+            cached = await redis.get(_SIGNALS_CACHE_KEY)
+            if cached:
+                return Response(content=cached, media_type="application/json")
         except Exception as e:
-            logger.error(f"Error reading signals for {coin}: {e}")
+            _cache_failed("read", e)
+            redis = None
+    
+    signals = _collect_signals()
+    
+    if redis is not None:
+        try:
+            await redis.set(
+                _SIGNALS_CACHE_KEY,
+                orjson.dumps(signals),
+                px=_SIGNALS_CACHE_TTL_MS
+            )
+        except Exception as e:
+            _cache_failed("write", e)
     
     return signals
 
@@ -200,27 +383,25 @@ async def get_coin_signal(coin: str):
     """Get signal for specific coin."""
     coin = coin.upper()
     
-    if coin not in settings.trading.coins:
+    if coin not in _coin_dirs:
         raise HTTPException(status_code=404, detail=f"Coin {coin} not configured")
     
     try:
-        coin_dir = settings.get_coin_dir(coin)
-        
-        long_file = coin_dir / "long_dca_signal.txt"
-        short_file = coin_dir / "short_dca_signal.txt"
-        
-        if not (long_file.exists() and short_file.exists()):
-            raise HTTPException(status_code=404, detail=f"No signals found for {coin}")
-        
-        return {
-            'coin': coin,
-            'long_strength': int(long_file.read_text().strip()),
-            'short_strength': int(short_file.read_text().strip()),
-            'timestamp': datetime.now().isoformat()
-        }
+        result = _read_signal_pair(coin)
     except Exception as e:
         logger.error(f"Error reading signal for {coin}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No signals found for {coin}")
+    
+    _, long_strength, short_strength = result
+    return {
+        'coin': coin,
+        'long_strength': long_strength,
+        'short_strength': short_strength,
+        'timestamp': datetime.now().isoformat()
+    }
 
 
 # ============================================================================
@@ -255,15 +436,15 @@ async def start_training(coin: str = None):
 async def get_training_status():
     """Get training status for all coins."""
     status = {}
+    now = datetime.now().timestamp()
     
-    for coin in settings.trading.coins:
+    for coin in _coins:
         try:
-            coin_dir = settings.get_coin_dir(coin)
-            timestamp_file = coin_dir / "trainer_last_training_time.txt"
+            result = _read_cached(_coin_dirs[coin] / "trainer_last_training_time.txt", float)
             
-            if timestamp_file.exists():
-                timestamp = float(timestamp_file.read_text().strip())
-                age_days = (datetime.now().timestamp() - timestamp) / 86400
+            if result is not None:
+                timestamp = result
+                age_days = (now - timestamp) / 86400
                 
                 status[coin] = {
                     'last_trained': datetime.fromtimestamp(timestamp).isoformat(),
@@ -286,20 +467,79 @@ async def get_training_status():
 # WEBSOCKET
 # ============================================================================
 
+# Latest signals per coin, kept current by the file watcher
+latest_signals: Dict[str, Dict] = {}
+
+# One queue per connected WebSocket client; an item means "signals changed"
+_signal_subscribers: Set[asyncio.Queue] = set()
+
+_signal_observer: Optional[Observer] = None
+
+
+async def _publish_signal(coin: str) -> None:
+    """Re-read a coin's signal files and notify WebSocket clients.
+    
+    Args:
+        coin: Coin whose signal files changed
+    """
+    try:
+        result = _read_signal_pair(coin)
+    except ValueError:
+        # File caught mid-write; the follow-up modify event will retry
+        return
+    except Exception as e:
+        logger.error(f"Error reading signals for {coin}: {e}")
+        return
+    
+    if result is None:
+        if latest_signals.pop(coin, None) is None:
+            return
+    else:
+        _, long_strength, short_strength = result
+        current = latest_signals.get(coin)
+        if (
+            current is not None
+            and current['long_strength'] == long_strength
+            and current['short_strength'] == short_strength
+        ):
+            return
+        
+        latest_signals[coin] = {
+            'long_strength': long_strength,
+            'short_strength': short_strength,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    for queue in _signal_subscribers:
+        try:
+            queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # Client already has an unsent notification; it will pick up
+            # the latest snapshot when it sends
+            pass
+
+
 @app.websocket("/ws/signals")
 async def websocket_signals(websocket: WebSocket):
-    """WebSocket endpoint for real-time signals."""
+    """WebSocket endpoint for real-time signals.
+    
+    Sends the current snapshot on connect, then a fresh snapshot each time
+    a signal file changes.
+    """
     await websocket.accept()
     
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    _signal_subscribers.add(queue)
+    
     try:
+        await websocket.send_text(orjson.dumps(latest_signals).decode())
         while True:
-            # TODO: Implement real-time signal streaming
-            signals = await get_signals()
-            await websocket.send_json(signals)
-            await asyncio.sleep(1)
+            await queue.get()
+            await websocket.send_text(orjson.dumps(latest_signals).decode())
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
+        _signal_subscribers.discard(queue)
         await websocket.close()
 
 
@@ -314,20 +554,54 @@ async def startup_event():
     logger.info(f"Trading Mode: {settings.trading_mode.value}")
     logger.info(f"Exchange: {settings.exchange.value}")
     logger.info(f"Coins: {', '.join(settings.trading.coins)}")
+    
+    global _signal_observer
+    if settings.redis.enabled:
+        app.state.redis_pool = settings.create_redis_pool()
+        app.state.redis = aioredis.Redis(connection_pool=app.state.redis_pool)
+    
+    latest_signals.update(_collect_signals())
+    
+    _signal_observer = Observer()
+    _signal_observer.schedule(
+        SignalFileHandler(
+            {path: coin for coin, path in _coin_dirs.items()},
+            _publish_signal,
+            asyncio.get_running_loop()
+        ),
+        str(settings.data_dir),
+        recursive=True
+    )
+    _signal_observer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Clean up on shutdown."""
+    redis = getattr(app.state, 'redis', None)
+    if redis is not None:
+        await redis.aclose()
+        await app.state.redis_pool.disconnect()
+    
+    if _signal_observer is not None:
+        _signal_observer.stop()
+        _signal_observer.join()
 
 
 if __name__ == "__main__":
     import uvicorn
-    import asyncio
     
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
+    # Import-string form is required for uvicorn to spawn worker processes;
+    # its "auto" loop and http pick uvloop and httptools when installed
     uvicorn.run(
-        app,
+        "api:app",
         host=settings.api.host,
         port=settings.api.port,
-        reload=settings.api.reload
+        reload=settings.api.reload,
+        workers=settings.api.workers
     )
@@ -4,13 +4,22 @@ Configuration management for PowerTrader Enhanced.
 Centralizes all configuration with environment variable support,
 validation, and type safety.
 """
+import functools
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from pydantic_settings import BaseSettings
 
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool
+
+
+# Directories already created by this process, so repeated Settings()
+# construction doesn't re-issue mkdir syscalls
+_created_dirs: Set[Path] = set()
+
 
 class TradingMode(str, Enum):
     """Trading execution modes."""
@@ -50,6 +59,21 @@ class TimeFrame(str, Enum):
     WEEK_1 = "1week"
 
 
+# Candle duration in seconds for each timeframe
+TIMEFRAME_SECONDS: Dict[str, int] = {
+    TimeFrame.MINUTE_1.value: 60,
+    TimeFrame.MINUTE_5.value: 300,
+    TimeFrame.MINUTE_15.value: 900,
+    TimeFrame.HOUR_1.value: 3600,
+    TimeFrame.HOUR_2.value: 7200,
+    TimeFrame.HOUR_4.value: 14400,
+    TimeFrame.HOUR_8.value: 28800,
+    TimeFrame.HOUR_12.value: 43200,
+    TimeFrame.DAY_1.value: 86400,
+    TimeFrame.WEEK_1.value: 604800,
+}
+
+
 class RiskConfig(BaseModel):
     """Risk management configuration."""
     max_position_size_pct: float = Field(default=10.0, ge=0.0, le=100.0)
@@ -79,6 +103,7 @@ class TradingConfig(BaseModel):
     pm_start_pct_no_dca: float = Field(default=5.0, ge=0.0)
     pm_start_pct_with_dca: float = Field(default=2.5, ge=0.0)
     trailing_gap_pct: float = Field(default=0.5, ge=0.0)
+    order_history_limit: int = Field(default=100_000, ge=1)
     
     @validator('coins', pre=True)
     def uppercase_coins(cls, v: List[str]) -> List[str]:
@@ -89,6 +114,7 @@ class TradingConfig(BaseModel):
 class ModelConfig(BaseModel):
     """Neural network model configuration."""
     lookback_candles: int = Field(default=100, ge=10)
+    training_candles: int = Field(default=500, ge=1)
     pattern_memory_size: int = Field(default=10000, ge=100)
     weight_decay: float = Field(default=0.9, ge=0.0, le=1.0)
     learning_rate: float = Field(default=0.25, ge=0.0, le=1.0)
@@ -108,11 +134,14 @@ class DatabaseConfig(BaseModel):
 
 class RedisConfig(BaseModel):
     """Redis configuration for message queuing."""
+    enabled: bool = False
     host: str = "localhost"
     port: int = Field(default=6379, ge=1, le=65535)
     db: int = Field(default=0, ge=0)
     password: Optional[str] = None
     ssl: bool = False
+    max_connections: int = Field(default=50, ge=1)
+    retry_seconds: float = Field(default=30.0, ge=0.0)  # skip Redis this long after a failure
 
 
 class APIConfig(BaseModel):
@@ -158,8 +187,13 @@ class Settings(BaseSettings):
     ui_refresh_seconds: float = Field(default=1.0, ge=0.1)
     chart_refresh_seconds: float = Field(default=2.0, ge=0.1)
     signal_check_seconds: float = Field(default=0.5, ge=0.1)
+    max_idle_seconds: float = Field(default=30.0, ge=0.1)
     health_check_seconds: float = Field(default=10.0, ge=1.0)
     
+    # Memoized path lookups (paths are derived from immutable-in-practice fields)
+    _coin_dir_cache: Dict[str, Path] = PrivateAttr(default_factory=dict)
+    _model_path_cache: Dict[Tuple[str, str], Path] = PrivateAttr(default_factory=dict)
+    
     class Config:
         """Pydantic config."""
         env_prefix = "PT_"
@@ -174,7 +208,10 @@ class Settings(BaseSettings):
     def _create_directories(self) -> None:
         """Create necessary directories if they don't exist."""
         for dir_path in [self.data_dir, self.models_dir, self.logs_dir]:
+            if dir_path in _created_dirs:
+                continue
             dir_path.mkdir(parents=True, exist_ok=True)
+            _created_dirs.add(dir_path)
     
     def get_coin_dir(self, coin: str) -> Path:
         """Get the data directory for a specific coin.
@@ -185,10 +222,14 @@ class Settings(BaseSettings):
         Returns:
             Path to coin's data directory
         """
-        coin = coin.upper().strip()
-        if coin == "BTC":
-            return self.data_dir
-        return self.data_dir / coin
+        cached = self._coin_dir_cache.get(coin)
+        if cached is not None:
+            return cached
+        
+        symbol = coin.upper().strip()
+        path = self.data_dir if symbol == "BTC" else self.data_dir / symbol
+        self._coin_dir_cache[coin] = path
+        return path
     
     def get_model_path(self, coin: str, timeframe: str) -> Path:
         """Get the model file path for a coin/timeframe.
@@ -200,24 +241,49 @@ class Settings(BaseSettings):
         Returns:
             Path to model file
         """
-        coin_dir = self.get_coin_dir(coin)
-        return coin_dir / f"model_{timeframe}.pkl"
-
-
-# Global settings instance
-_settings: Optional[Settings] = None
+        key = (coin, timeframe)
+        cached = self._model_path_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        path = self.get_coin_dir(coin) / f"model_{timeframe}.pkl"
+        self._model_path_cache[key] = path
+        return path
+    
+    def create_redis_pool(self) -> "ConnectionPool":
+        """Create an asyncio Redis connection pool from the redis config.
+        
+        This is the only supported way to get a Redis connection: it always
+        uses ``redis.asyncio`` so callers can't block the event loop with
+        the synchronous client.
+        
+        Returns:
+            Connection pool for ``redis.asyncio.Redis(connection_pool=...)``
+        """
+        from redis.asyncio import ConnectionPool, SSLConnection
+        
+        kwargs: Dict[str, Any] = {}
+        if self.redis.ssl:
+            kwargs['connection_class'] = SSLConnection
+        
+        return ConnectionPool(
+            host=self.redis.host,
+            port=self.redis.port,
+            db=self.redis.db,
+            password=self.redis.password,
+            max_connections=self.redis.max_connections,
+            **kwargs
+        )
 
 
+@functools.cache
 def get_settings() -> Settings:
     """Get the global settings instance.
     
     Returns:
         Settings instance
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
 def reload_settings() -> Settings:
@@ -226,6 +292,5 @@ def reload_settings() -> Settings:
     Returns:
         New settings instance
     """
-    global _settings
-    _settings = Settings()
-    return _settings
+    get_settings.cache_clear()
+    return get_settings()
@@ -4,16 +4,41 @@ Paper Trading Exchange - Simulates trading without real money.
 Perfect for testing strategies safely.
 """
 import asyncio
+import itertools
 import logging
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
 import uuid
 
+import httpx
+import numpy as np
+import orjson
+import websockets
+
 from config import Settings
 from models import Order, OrderSide, OrderStatus, Position
 
 logger = logging.getLogger(__name__)
 
+KUCOIN_API_URL = 'https://api.kucoin.com'
+
+# Shared keep-alive client so price lookups reuse one connection
+_http: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared KuCoin HTTP client, creating it on first use."""
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            base_url=KUCOIN_API_URL,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return _http
+
 
 class PaperExchange:
     """Simulated exchange for paper trading."""
@@ -28,17 +53,33 @@ class PaperExchange:
         
         # Simulated account
         self.cash = 10000.0  # Starting cash
-        self.positions: Dict[str, Dict] = {}
-        self.orders: List[Order] = []
+        
+        # Open positions stored column-wise; row i belongs to _symbols[i].
+        # Only the first _n rows are live, arrays grow geometrically.
+        self._n = 0
+        self._sym_idx: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._entry_time: List[datetime] = []
+        self._qty = np.zeros(8)
+        self._avg = np.zeros(8)
+        self._px = np.zeros(8)
+        self._realized = np.zeros(8)
+        self._dca_count = np.zeros(8, dtype=np.int64)
+        
+        self.orders: Deque[Order] = deque(maxlen=settings.trading.order_history_limit)
+        self._client_order_seq = itertools.count(1)
+        
+        # Recently fetched prices: symbol -> (price, expiry on monotonic clock)
+        self.price_cache_ttl = 0.5  # seconds
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._all_prices: Optional[Tuple[Dict[str, float], float]] = None
         
         logger.info(f"Paper exchange initialized with ${self.cash:.2f}")
     
     async def get_account(self) -> Dict:
         """Get simulated account balance."""
-        positions_value = sum(
-            pos['quantity'] * pos['current_price']
-            for pos in self.positions.values()
-        )
+        n = self._n
+        positions_value = float(np.dot(self._qty[:n], self._px[:n]))
         
         total_value = self.cash + positions_value
         
@@ -50,28 +91,71 @@ class PaperExchange:
     
     async def get_positions(self) -> Dict[str, Position]:
         """Get all simulated positions."""
-        positions = {}
+        if not self._n:
+            return {}
+        
+        # One batched ticker request covers every open position
+        all_prices = await self._get_all_prices()
         
-        for symbol, pos_data in self.positions.items():
+        # Look up prices for a snapshot of the symbols, then write them back
+        # by symbol in case an order changed the rows while awaiting
+        symbols = self._symbols[:self._n]
+        current_prices = {}
+        for symbol in symbols:
             # Get current price (simulated)
-            current_price = await self._get_simulated_price(symbol)
-            
-            market_value = pos_data['quantity'] * current_price
-            unrealized_pnl = market_value - (pos_data['quantity'] * pos_data['avg_cost'])
-            unrealized_pnl_pct = (unrealized_pnl / (pos_data['quantity'] * pos_data['avg_cost'])) * 100
-            
+            current_price = all_prices.get(self._to_kucoin_symbol(symbol))
+            if current_price is None:
+                current_price = await self._get_simulated_price(symbol)
+            current_prices[symbol] = current_price
+        
+        for symbol, current_price in current_prices.items():
+            idx = self._sym_idx.get(symbol)
+            if idx is not None:
+                self._px[idx] = current_price
+        
+        # P&L for all positions at once
+        n = self._n
+        quantity = self._qty[:n]
+        avg_cost = self._avg[:n]
+        price = self._px[:n]
+        
+        cost_basis = quantity * avg_cost
+        market_value = quantity * price
+        unrealized_pnl = market_value - cost_basis
+        unrealized_pnl_pct = np.divide(
+            unrealized_pnl * 100,
+            cost_basis,
+            out=np.zeros(n),
+            where=cost_basis > 0
+        )
+        
+        positions = {}
+        now = datetime.now()
+        
+        for symbol, entry_time, qty, avg, px, value, pnl, pnl_pct, realized, dca in zip(
+            self._symbols[:n],
+            self._entry_time[:n],
+            quantity.tolist(),
+            avg_cost.tolist(),
+            price.tolist(),
+            market_value.tolist(),
+            unrealized_pnl.tolist(),
+            unrealized_pnl_pct.tolist(),
+            self._realized[:n].tolist(),
+            self._dca_count[:n].tolist()
+        ):
             positions[symbol] = Position(
                 symbol=symbol,
-                quantity=pos_data['quantity'],
-                avg_cost_basis=pos_data['avg_cost'],
-                current_price=current_price,
-                market_value=market_value,
-                unrealized_pnl=unrealized_pnl,
-                unrealized_pnl_pct=unrealized_pnl_pct,
-                realized_pnl=pos_data.get('realized_pnl', 0.0),
-                dca_count=pos_data.get('dca_count', 0),
-                entry_time=pos_data['entry_time'],
-                last_update=datetime.now()
+                quantity=qty,
+                avg_cost_basis=avg,
+                current_price=px,
+                market_value=value,
+                unrealized_pnl=pnl,
+                unrealized_pnl_pct=pnl_pct,
+                realized_pnl=realized,
+                dca_count=dca,
+                entry_time=entry_time,
+                last_update=now
             )
         
         return positions
@@ -79,14 +163,93 @@ class PaperExchange:
     async def get_quote(self, symbol: str) -> Dict:
         """Get simulated quote."""
         price = await self._get_simulated_price(symbol)
+        return self._make_quote(price, datetime.now())
+    
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get simulated quotes for several symbols from one ticker request.
+        
+        Args:
+            symbols: Trading symbols (e.g. "BTC-USD")
+            
+        Returns:
+            Quote by symbol
+        """
+        prices = await self._get_all_prices()
+        now = datetime.now()
+        
+        quotes = {}
+        for symbol in symbols:
+            price = prices.get(self._to_kucoin_symbol(symbol))
+            if price is None:
+                price = await self._get_simulated_price(symbol)
+            quotes[symbol] = self._make_quote(price, now)
+        
+        return quotes
+    
+    async def subscribe_l1(self, symbols: List[str]) -> AsyncIterator[Tuple[str, Dict]]:
+        """Stream simulated quotes from KuCoin's public ticker channel.
+        
+        Runs until the connection drops or the consumer stops iterating.
+        Each update also refreshes the symbol's cached price.
+        
+        Args:
+            symbols: Trading symbols (e.g. "BTC-USD")
+            
+        Yields:
+            (symbol, quote) for every ticker update
+        """
+        response = await _get_http_client().post('/api/v1/bullet-public')
+        response.raise_for_status()
+        bullet = orjson.loads(response.content)['data']
+        server = bullet['instanceServers'][0]
+        ping_interval = server['pingInterval'] / 1000.0
+        url = f"{server['endpoint']}?token={bullet['token']}&connectId={uuid.uuid4().hex}"
         
-        # Simulate spread (0.1%)
+        by_pair = {self._to_kucoin_symbol(symbol): symbol for symbol in symbols}
+        
+        async with websockets.connect(url, ping_interval=None) as ws:
+            await ws.send(orjson.dumps({
+                'id': uuid.uuid4().hex,
+                'type': 'subscribe',
+                'topic': '/market/ticker:' + ','.join(by_pair),
+                'privateChannel': False,
+                'response': True
+            }))
+            
+            # KuCoin drops clients that don't send an application-level ping
+            next_ping = time.monotonic() + ping_interval
+            while True:
+                try:
+                    raw = await asyncio.wait_for(
+                        ws.recv(),
+                        timeout=max(0.0, next_ping - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    await ws.send(orjson.dumps({'id': uuid.uuid4().hex, 'type': 'ping'}))
+                    next_ping = time.monotonic() + ping_interval
+                    continue
+                
+                msg = orjson.loads(raw)
+                if msg.get('type') != 'message':
+                    continue
+                
+                symbol = by_pair.get(msg['topic'].rsplit(':', 1)[-1])
+                if symbol is None:
+                    continue
+                
+                price = float(msg['data']['price'])
+                self._price_cache[symbol] = (price, time.monotonic() + self.price_cache_ttl)
+                yield symbol, self._make_quote(price, datetime.now())
+    
+    @staticmethod
+    def _make_quote(price: float, timestamp: datetime) -> Dict:
+        """Build a quote around a price with a simulated 0.1% spread."""
         spread = price * 0.001
         
         return {
             'bid': price - spread / 2,
             'ask': price + spread / 2,
-            'timestamp': datetime.now()
+            'timestamp': timestamp
         }
     
     async def place_market_order(
@@ -115,7 +278,7 @@ class PaperExchange:
         # Create order
         order = Order(
             order_id=str(uuid.uuid4()),
-            client_order_id=str(uuid.uuid4()),
+            client_order_id=f"pt-{next(self._client_order_seq)}",
             symbol=symbol,
             side=side,
             type="market",
@@ -144,6 +307,75 @@ class PaperExchange:
         
         return order
     
+    async def place_market_orders(
+        self,
+        orders: List[Tuple[str, OrderSide, float]]
+    ) -> List[Union[Order, Exception]]:
+        """Simulate placing several market orders in one request.
+        
+        Prices for every symbol come from a single ticker request; fills
+        are then applied in submission order.
+        
+        Args:
+            orders: (symbol, side, notional) for each order
+            
+        Returns:
+            The filled order, or the exception that rejected it, for each
+            entry in ``orders``
+        """
+        prices = await self._get_all_prices()
+        expiry = time.monotonic() + self.price_cache_ttl
+        for symbol, _, _ in orders:
+            price = prices.get(self._to_kucoin_symbol(symbol))
+            if price is not None:
+                self._price_cache[symbol] = (price, expiry)
+        
+        results: List[Union[Order, Exception]] = []
+        for symbol, side, notional in orders:
+            try:
+                results.append(await self.place_market_order(symbol, side, notional))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _add_position(self, symbol: str, quantity: float, price: float) -> None:
+        """Append a new position row, growing the arrays if full."""
+        n = self._n
+        if n == len(self._qty):
+            capacity = 2 * n
+            for name in ('_qty', '_avg', '_px', '_realized', '_dca_count'):
+                old = getattr(self, name)
+                new = np.zeros(capacity, dtype=old.dtype)
+                new[:n] = old[:n]
+                setattr(self, name, new)
+        
+        self._sym_idx[symbol] = n
+        self._symbols.append(symbol)
+        self._entry_time.append(datetime.now())
+        self._qty[n] = quantity
+        self._avg[n] = price
+        self._px[n] = price
+        self._realized[n] = 0.0
+        self._dca_count[n] = 0
+        self._n = n + 1
+    
+    def _remove_position(self, symbol: str) -> None:
+        """Remove a position row by moving the last row into its slot."""
+        idx = self._sym_idx.pop(symbol)
+        last = self._n - 1
+        
+        if idx != last:
+            moved = self._symbols[last]
+            self._sym_idx[moved] = idx
+            self._symbols[idx] = moved
+            self._entry_time[idx] = self._entry_time[last]
+            for arr in (self._qty, self._avg, self._px, self._realized, self._dca_count):
+                arr[idx] = arr[last]
+        
+        self._symbols.pop()
+        self._entry_time.pop()
+        self._n = last
+    
     def _execute_buy(self, symbol: str, quantity: float, price: float):
         """Execute simulated buy."""
         cost = quantity * price
@@ -153,71 +385,114 @@ class PaperExchange:
         
         self.cash -= cost
         
-        if symbol in self.positions:
+        idx = self._sym_idx.get(symbol)
+        if idx is not None:
             # Add to existing position
-            pos = self.positions[symbol]
-            total_cost = (pos['quantity'] * pos['avg_cost']) + cost
-            total_quantity = pos['quantity'] + quantity
-            pos['avg_cost'] = total_cost / total_quantity
-            pos['quantity'] = total_quantity
-            pos['dca_count'] = pos.get('dca_count', 0) + 1
+            total_cost = (self._qty[idx] * self._avg[idx]) + cost
+            total_quantity = self._qty[idx] + quantity
+            self._avg[idx] = total_cost / total_quantity
+            self._qty[idx] = total_quantity
+            self._dca_count[idx] += 1
         else:
             # New position
-            self.positions[symbol] = {
-                'quantity': quantity,
-                'avg_cost': price,
-                'current_price': price,
-                'entry_time': datetime.now(),
-                'dca_count': 0,
-                'realized_pnl': 0.0
-            }
+            self._add_position(symbol, quantity, price)
     
     def _execute_sell(self, symbol: str, quantity: float, price: float):
         """Execute simulated sell."""
-        if symbol not in self.positions:
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
             raise ValueError(f"No position in {symbol}")
         
-        pos = self.positions[symbol]
+        held = float(self._qty[idx])
         
-        if quantity > pos['quantity']:
+        if quantity > held:
             raise ValueError(
-                f"Insufficient quantity: {quantity} > {pos['quantity']}"
+                f"Insufficient quantity: {quantity} > {held}"
             )
         
         # Calculate P&L
         proceeds = quantity * price
-        cost_basis = quantity * pos['avg_cost']
+        cost_basis = quantity * float(self._avg[idx])
         realized_pnl = proceeds - cost_basis
         
         self.cash += proceeds
-        pos['realized_pnl'] = pos.get('realized_pnl', 0.0) + realized_pnl
+        self._realized[idx] += realized_pnl
         
         # Update or close position
-        if quantity >= pos['quantity']:
+        if quantity >= held:
             logger.info(f"PAPER: Closed position in {symbol}, P&L: ${realized_pnl:.2f}")
-            del self.positions[symbol]
+            self._remove_position(symbol)
         else:
-            pos['quantity'] -= quantity
+            self._qty[idx] -= quantity
+    
+    @staticmethod
+    def _to_kucoin_symbol(symbol: str) -> str:
+        """Convert a trading symbol (BTC-USD) to its KuCoin pair (BTC-USDT)."""
+        coin = symbol.replace("-USD", "")
+        return f"{coin}-USDT"
+    
+    async def _get_all_prices(self) -> Dict[str, float]:
+        """Get last prices for every KuCoin pair in a single request.
+        
+        Results are cached for ``price_cache_ttl`` seconds and also seed
+        the per-symbol cache for open positions.
+        
+        Returns:
+            Dictionary of last price by KuCoin symbol (e.g. "BTC-USDT"),
+            empty if the request fails
+        """
+        now = time.monotonic()
+        if self._all_prices is not None and self._all_prices[1] > now:
+            return self._all_prices[0]
+        
+        try:
+            response = await _get_http_client().get('/api/v1/market/allTickers')
+            response.raise_for_status()
+            prices = {
+                ticker['symbol']: float(ticker['last'])
+                for ticker in orjson.loads(response.content)['data']['ticker']
+                if ticker.get('last')
+            }
+        except Exception as e:
+            logger.error(f"Error fetching all tickers: {e}")
+            return {}
+        
+        expiry = now + self.price_cache_ttl
+        self._all_prices = (prices, expiry)
+        
+        for symbol in self._symbols:
+            price = prices.get(self._to_kucoin_symbol(symbol))
+            if price is not None:
+                self._price_cache[symbol] = (price, expiry)
+        
+        return prices
     
     async def _get_simulated_price(self, symbol: str) -> float:
         """Get simulated price from real market data.
         
-        For paper trading realism, we fetch real prices.
+        For paper trading realism, we fetch real prices. Prices are cached
+        per symbol for ``price_cache_ttl`` seconds.
         """
+        now = time.monotonic()
+        cached = self._price_cache.get(symbol)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        
         try:
-            from kucoin.client import Market
-            market = Market(url='https://api.kucoin.com')
-            
-            # Convert BTC-USD to BTC-USDT for KuCoin
-            coin = symbol.replace("-USD", "")
-            kucoin_symbol = f"{coin}-USDT"
+            response = await _get_http_client().get(
+                '/api/v1/market/orderbook/level1',
+                params={'symbol': self._to_kucoin_symbol(symbol)}
+            )
+            response.raise_for_status()
+            price = float(orjson.loads(response.content)['data']['price'])
             
-            ticker = market.get_ticker(kucoin_symbol)
-            return float(ticker['price'])
+            self._price_cache[symbol] = (price, now + self.price_cache_ttl)
+            return price
             
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
             # Return last known price or default
-            if symbol in self.positions:
-                return self.positions[symbol].get('current_price', 50000.0)
+            idx = self._sym_idx.get(symbol)
+            if idx is not None:
+                return float(self._px[idx])
             return 50000.0  # Fallback
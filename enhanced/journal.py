@@ -0,0 +1,101 @@
+"""
+Append-only journal of trading engine state.
+
+The engine keeps its working state in memory and appends each change
+here as one row of a SQLite table in WAL mode. On restart the rows are
+replayed in order to rebuild that state, then compacted down to a
+snapshot so the log does not grow without bound.
+"""
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Event types
+DCA = 'dca'        # value: wall-clock time of the DCA buy
+PEAK = 'peak'      # value: new trailing peak price
+CLOSE = 'close'    # position closed; clears the symbol's state
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    value REAL
+)
+"""
+_INSERT = "INSERT INTO events (ts, type, symbol, value) VALUES (?, ?, ?, ?)"
+
+
+class StateJournal:
+    """SQLite-backed append log of engine state changes."""
+    
+    def __init__(self, path: Union[str, Path]):
+        """Open (or create) the journal.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        
+        # Autocommit; WAL with synchronous=NORMAL makes each append a
+        # sequential write with no fsync on the trading path. Writes may
+        # come from a worker thread, one at a time
+        self._conn = sqlite3.connect(
+            str(self.path), isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+    
+    def extend(self, events: Iterable[Tuple[str, str, Optional[float]]]) -> None:
+        """Record several state changes in one transaction.
+        
+        Args:
+            events: (event_type, symbol, value) rows, in order; the type is
+                DCA, PEAK or CLOSE and value is None for types without one
+        """
+        now = time.time()
+        rows = [(now, event_type, symbol, value) for event_type, symbol, value in events]
+        if not rows:
+            return
+        
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_INSERT, rows)
+        except sqlite3.Error as e:
+            logger.warning("Could not journal %d events: %s", len(rows), e)
+    
+    def replay(self) -> Iterator[Tuple[str, str, Optional[float]]]:
+        """Yield every recorded event in the order it was appended.
+        
+        Returns:
+            Iterator of (event_type, symbol, value)
+        """
+        return iter(self._conn.execute(
+            "SELECT type, symbol, value FROM events ORDER BY id"
+        ).fetchall())
+    
+    def compact(self, events: Iterable[Tuple[str, str, Optional[float]]]) -> None:
+        """Replace the log with a snapshot of the current state.
+        
+        Args:
+            events: (event_type, symbol, value) rows that rebuild the state
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM events")
+            self._conn.executemany(
+                _INSERT,
+                [(now, event_type, symbol, value) for event_type, symbol, value in events]
+            )
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
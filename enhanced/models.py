@@ -5,9 +5,13 @@ All data structures with validation, serialization, and type safety.
 """
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Annotated, Dict, List, NamedTuple, Optional, Sequence, Union
 
-from pydantic import BaseModel, Field, validator
+import msgspec
+import numpy as np
+from pydantic import (
+    BaseModel, ConfigDict, Field, model_validator, validator
+)
 
 
 class OrderSide(str, Enum):
@@ -54,8 +58,14 @@ class SignalType(str, Enum):
 
 # ===== Market Data Models =====
 
+# Column order of a KuCoin kline row
+KLINE_FIELDS = ('timestamp', 'open', 'close', 'high', 'low', 'volume')
+
+
 class Candle(BaseModel):
     """OHLCV candle data."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     timestamp: datetime
     open: float = Field(gt=0)
     high: float = Field(gt=0)
@@ -63,31 +73,78 @@ class Candle(BaseModel):
     close: float = Field(gt=0)
     volume: float = Field(ge=0)
     
-    @validator('high')
-    def high_is_highest(cls, v: float, values: Dict) -> float:
-        """Validate high is the highest price."""
-        if 'low' in values and v < values['low']:
+    @model_validator(mode='after')
+    def check_ohlc(self) -> 'Candle':
+        """Validate high is the highest price and low is the lowest."""
+        high = self.high
+        low = self.low
+        if high < low:
             raise ValueError("High must be >= low")
-        if 'open' in values and v < values['open']:
+        if high < self.open:
             raise ValueError("High must be >= open")
-        if 'close' in values and v < values['close']:
+        if high < self.close:
             raise ValueError("High must be >= close")
-        return v
+        if low > self.open:
+            raise ValueError("Low must be <= open")
+        if low > self.close:
+            raise ValueError("Low must be <= close")
+        return self
+
+
+class CandleArray(NamedTuple):
+    """OHLCV candles as parallel columns, for bulk numeric work."""
+    timestamp: np.ndarray  # epoch seconds, int64
+    open: np.ndarray
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    volume: np.ndarray
     
-    @validator('low')
-    def low_is_lowest(cls, v: float, values: Dict) -> float:
-        """Validate low is the lowest price."""
-        if 'high' in values and v > values['high']:
-            raise ValueError("Low must be <= high")
-        if 'open' in values and v > values['open']:
+    @classmethod
+    def from_klines(cls, rows: Sequence[Sequence]) -> 'CandleArray':
+        """Parse and validate raw kline rows in one pass.
+        
+        Applies the same checks as ``Candle`` to every row at once.
+        
+        Args:
+            rows: Kline rows as [time, open, close, high, low, volume, ...]
+            
+        Returns:
+            Columns in the same order as ``rows``
+            
+        Raises:
+            ValueError: If any row fails validation
+        """
+        raw = np.array(rows, dtype=np.float64).reshape(len(rows), -1)
+        if raw.shape[1] < len(KLINE_FIELDS):
+            raise ValueError(f"Kline rows need {len(KLINE_FIELDS)} columns")
+        
+        timestamp, open_, close, high, low, volume = (
+            raw[:, k] for k in range(len(KLINE_FIELDS))
+        )
+        
+        if not (raw[:, 1:5] > 0).all():
+            raise ValueError("Prices must be > 0")
+        if not (volume >= 0).all():
+            raise ValueError("Volume must be >= 0")
+        if (high < low).any():
+            raise ValueError("High must be >= low")
+        if (high < open_).any():
+            raise ValueError("High must be >= open")
+        if (high < close).any():
+            raise ValueError("High must be >= close")
+        if (low > open_).any():
             raise ValueError("Low must be <= open")
-        if 'close' in values and v > values['close']:
+        if (low > close).any():
             raise ValueError("Low must be <= close")
-        return v
+        
+        return cls(timestamp.astype(np.int64), open_, close, high, low, volume)
 
 
 class Quote(BaseModel):
     """Current bid/ask quote."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     symbol: str
     timestamp: datetime
     bid: float = Field(gt=0)
@@ -172,7 +229,7 @@ class Trade(BaseModel):
 class Pattern(BaseModel):
     """Price pattern for neural network."""
     timeframe: str
-    pattern_hash: str
+    pattern_hash: int
     close_changes: List[float]
     high_changes: List[float]
     low_changes: List[float]
@@ -187,6 +244,8 @@ class Pattern(BaseModel):
 
 class Prediction(BaseModel):
     """Neural network prediction."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     symbol: str
     timeframe: str
     timestamp: datetime
@@ -200,6 +259,8 @@ class Prediction(BaseModel):
 
 class NeuralSignal(BaseModel):
     """Trading signal from neural network."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     symbol: str
     timestamp: datetime
     long_strength: int = Field(ge=0, le=7)
@@ -266,23 +327,26 @@ class ComponentStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
-class HealthCheck(BaseModel):
+# Health responses are built on every poll and only ever encoded, never
+# parsed from input, so they use msgspec structs instead of Pydantic models.
+
+class HealthCheck(msgspec.Struct, kw_only=True):
     """Health check result."""
     component: str
     status: ComponentStatus
     timestamp: datetime
-    latency_ms: Optional[float] = Field(None, ge=0)
+    latency_ms: Optional[Annotated[float, msgspec.Meta(ge=0)]] = None
     message: Optional[str] = None
-    metadata: Dict = Field(default_factory=dict)
+    metadata: Dict = msgspec.field(default_factory=dict)
 
 
-class SystemStatus(BaseModel):
+class SystemStatus(msgspec.Struct, kw_only=True):
     """Overall system status."""
     timestamp: datetime
     trading_mode: str
     is_trading: bool
     components: Dict[str, HealthCheck]
-    uptime_seconds: float = Field(ge=0)
+    uptime_seconds: Annotated[float, msgspec.Meta(ge=0)]
     
     @property
     def overall_status(self) -> ComponentStatus:
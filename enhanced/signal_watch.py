@@ -0,0 +1,56 @@
+"""
+Signal file change notifications.
+
+The signal generator writes each coin's long/short strengths to small
+text files. Both the trading engine and the API watch those files with
+watchdog and react on their own event loop; this module holds the
+shared handler.
+"""
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+
+LONG_SIGNAL_FILE = "long_dca_signal.txt"
+SHORT_SIGNAL_FILE = "short_dca_signal.txt"
+SIGNAL_FILES = frozenset((LONG_SIGNAL_FILE, SHORT_SIGNAL_FILE))
+
+
+class SignalFileHandler(FileSystemEventHandler):
+    """Forwards signal file changes from the watchdog thread to a loop."""
+    
+    def __init__(
+        self,
+        coins_by_dir: Dict[Path, str],
+        on_change: Callable[[str], Coroutine[Any, Any, None]],
+        loop: asyncio.AbstractEventLoop
+    ):
+        """Initialize handler.
+        
+        Args:
+            coins_by_dir: Coin whose signal files live in each directory
+            on_change: Coroutine function run with the coin on each change
+            loop: Event loop to run ``on_change`` on
+        """
+        self.coins_by_dir = coins_by_dir
+        self.on_change = on_change
+        self.loop = loop
+    
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        """Schedule ``on_change`` for any change to a signal file."""
+        if event.is_directory:
+            return
+        
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            if not path:
+                continue
+            
+            path = Path(os.fsdecode(path))
+            if path.name not in SIGNAL_FILES:
+                continue
+            
+            coin = self.coins_by_dir.get(path.parent)
+            if coin is not None:
+                asyncio.run_coroutine_threadsafe(self.on_change(coin), self.loop)
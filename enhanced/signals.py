@@ -10,19 +10,28 @@ Improvements over original:
 - Health monitoring
 """
 import asyncio
+import bisect
 import logging
+import os
+import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 from kucoin.client import Market
 
-from config import Settings, TimeFrame, get_settings
+from _jit import weighted_predict
+from config import TIMEFRAME_SECONDS, Settings, TimeFrame, get_settings
 from models import NeuralSignal, Prediction, SignalType
 from trainer import PatternMemory
 
 logger = logging.getLogger(__name__)
 
+# Lower edges (% move) of signal strengths 1-7; below the first edge is 0
+_STRENGTH_BINS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0)
+
 
 class SignalGenerator:
     """Generates trading signals from neural network predictions."""
@@ -41,52 +50,91 @@ class SignalGenerator:
         self.settings = settings or get_settings()
         self.market = market_client or Market(url='https://api.kucoin.com')
         
-        # Load all trained models
+        # Per-tick lookups, computed once from settings. Strings used as
+        # dict keys are interned so lookups usually match on identity
+        coins = self._coins = [sys.intern(coin) for coin in self.settings.trading.coins]
+        self._tf_values: List[str] = [
+            sys.intern(tf.value) for tf in self.settings.trading.timeframes
+        ]
+        self._symbols: Dict[str, str] = {
+            coin: sys.intern(f"{coin}-USDT") for coin in coins
+        }
+        self._memory_keys: Dict[Tuple[str, str], str] = {
+            (coin, tf): sys.intern(f"{coin}_{tf}") for coin in coins for tf in self._tf_values
+        }
+        self._lookback = self.settings.model.lookback_candles
+        self._tolerance = self.settings.model.distance_tolerance_pct
+        self._start_level = self.settings.trading.trade_start_level
+        
+        # Load all trained models; memories are read-only here, so each
+        # one's prediction table is built once at load
         self.memories: Dict[str, PatternMemory] = {}
+        self._prediction_tables: Dict[str, np.ndarray] = {}
         self._load_all_models()
         
         # Cache recent candles to avoid repeated fetches
         self.candle_cache: Dict[str, List] = {}
-        self.cache_ttl = 60  # seconds
-        self.last_cache_update: Dict[str, datetime] = {}
+        self.cache_ttl = 60  # seconds, upper bound while a bar is open
+        self.candle_cache_expiry: Dict[str, float] = {}  # epoch seconds
+        self._inflight: Dict[str, asyncio.Future] = {}  # fetches in progress
+        
+        # Last match result per memory: (query key, memory size, expiry, result)
+        self._match_cache: Dict[str, Tuple[bytes, int, float, Optional[Tuple]]] = {}
+        
+        # Last training timestamp per coin, keyed by the file's mtime
+        self._training_time_cache: Dict[str, Tuple[int, float]] = {}
+        
+        # Last (long, short) strengths written per coin, and dirs known to exist
+        self._last_written: Dict[str, Tuple[int, int]] = {}
+        self._created_dirs: Set[Path] = set()
     
     def _load_all_models(self) -> None:
         """Load all trained pattern memories."""
         logger.info("Loading trained models...")
         
-        for coin in self.settings.trading.coins:
-            for timeframe in self.settings.trading.timeframes:
-                model_path = self.settings.get_model_path(coin, timeframe.value)
-                
-                if not model_path.exists():
-                    logger.warning(f"Model not found: {model_path}")
-                    continue
-                
-                memory = PatternMemory(max_size=self.settings.model.pattern_memory_size)
-                memory.load(model_path)
-                
-                key = f"{coin}_{timeframe.value}"
-                self.memories[key] = memory
-                
-                logger.info(f"Loaded {len(memory.patterns)} patterns for {key}")
+        for (coin, timeframe), key in self._memory_keys.items():
+            model_path = self.settings.get_model_path(coin, timeframe)
+            
+            if not model_path.exists():
+                logger.warning(f"Model not found: {model_path}")
+                continue
+            
+            memory = PatternMemory(max_size=self.settings.model.pattern_memory_size)
+            memory.load(model_path)
+            
+            self.memories[key] = memory
+            self._prediction_tables[key] = memory.prediction_table()
+            
+            logger.info(f"Loaded {len(memory)} patterns for {key}")
     
-    def _is_model_fresh(self, coin: str) -> bool:
+    def _is_model_fresh(self, coin: str, now: Optional[datetime] = None) -> bool:
         """Check if model was trained recently.
         
         Args:
             coin: Coin symbol
+            now: Reference time, defaults to the current time
             
         Returns:
             True if model is fresh (< 14 days old)
         """
         timestamp_file = self.settings.get_coin_dir(coin) / "trainer_last_training_time.txt"
         
-        if not timestamp_file.exists():
+        try:
+            st = timestamp_file.stat()
+        except FileNotFoundError:
             return False
         
         try:
-            timestamp = float(timestamp_file.read_text().strip())
-            age_days = (datetime.now().timestamp() - timestamp) / 86400
+            # Only re-read the file when the trainer has rewritten it
+            cached = self._training_time_cache.get(coin)
+            if cached is not None and cached[0] == st.st_mtime_ns:
+                timestamp = cached[1]
+            else:
+                timestamp = float(timestamp_file.read_text().strip())
+                self._training_time_cache[coin] = (st.st_mtime_ns, timestamp)
+            
+            now = now or datetime.now()
+            age_days = (now.timestamp() - timestamp) / 86400
             return age_days <= self.settings.model.training_stale_days
         except Exception as e:
             logger.error(f"Error checking model freshness for {coin}: {e}")
@@ -109,73 +157,156 @@ class SignalGenerator:
             List of candles
         """
         cache_key = f"{symbol}_{timeframe}"
-        now = datetime.now()
+        now = time.time()
         
         # Check cache
         if cache_key in self.candle_cache:
-            last_update = self.last_cache_update.get(cache_key)
-            if last_update and (now - last_update).total_seconds() < self.cache_ttl:
+            if now < self.candle_cache_expiry.get(cache_key, 0.0):
                 return self.candle_cache[cache_key]
         
-        # Fetch fresh data
+        # Share a fetch that is already running for the same key; shield it
+        # so a cancelled waiter doesn't cancel the fetch for everyone else
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
         try:
-            data = self.market.get_kline(symbol, timeframe, limit=limit)
-            self.candle_cache[cache_key] = data
-            self.last_cache_update[cache_key] = now
+            data = await self._fetch_candles(symbol, timeframe, limit, now)
+            future.set_result(data)
             return data
+        finally:
+            del self._inflight[cache_key]
+            if not future.done():
+                future.set_result([])
+    
+    async def _fetch_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        now: float
+    ) -> List:
+        """Fetch candles from KuCoin and cache them until the bar closes.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles
+            now: Epoch seconds the cache expiry is computed from
+            
+        Returns:
+            List of candles, or an empty list if the fetch failed
+        """
+        cache_key = f"{symbol}_{timeframe}"
+        
+        # Fetch fresh data off the event loop so timeframes can overlap
+        try:
+            data = await asyncio.to_thread(
+                self.market.get_kline, symbol, timeframe, limit=limit
+            )
         except Exception as e:
             logger.error(f"Failed to fetch candles for {symbol} {timeframe}: {e}")
             return []
+        
+        # Expire when the current bar closes, but refresh at least every
+        # min(cache_ttl, bar / 2) since the open bar's close is the live price
+        tf_seconds = TIMEFRAME_SECONDS.get(timeframe, self.cache_ttl)
+        next_bar = (now // tf_seconds + 1) * tf_seconds
+        self.candle_cache[cache_key] = data
+        self.candle_cache_expiry[cache_key] = min(
+            next_bar,
+            now + min(self.cache_ttl, tf_seconds / 2)
+        )
+        return data
     
-    def _extract_current_pattern(self, candles: List) -> tuple:
+    def _extract_current_pattern(
+        self,
+        candles: List
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
         """Extract price change pattern from recent candles.
         
         Args:
             candles: Raw candle data from API
             
         Returns:
-            Tuple of (close_changes, high_changes, low_changes, current_price)
+            Tuple of (close_changes, high_changes, low_changes, current_price);
+            the change arrays are empty if there are too few candles
         """
-        if len(candles) < self.settings.model.lookback_candles + 1:
-            return [], [], [], 0.0
+        lookback = self._lookback
         
-        close_changes = []
-        high_changes = []
-        low_changes = []
+        if len(candles) < lookback + 1:
+            empty = np.empty(0)
+            return empty, empty, empty, 0.0
         
         # Candles are [time, open, close, high, low, volume]
-        # Newest first in array
-        for i in range(self.settings.model.lookback_candles):
-            curr = candles[i]
-            prev = candles[i + 1]
-            
-            curr_close = float(curr[2])
-            prev_close = float(prev[2])
-            curr_high = float(curr[3])
-            prev_high = float(prev[3])
-            curr_low = float(curr[4])
-            prev_low = float(prev[4])
-            
-            if prev_close == 0:
-                continue
-            
-            close_change = ((curr_close - prev_close) / prev_close) * 100
-            high_change = ((curr_high - prev_high) / prev_high) * 100 if prev_high > 0 else 0.0
-            low_change = ((curr_low - prev_low) / prev_low) * 100 if prev_low > 0 else 0.0
-            
-            close_changes.append(close_change)
-            high_changes.append(high_change)
-            low_changes.append(low_change)
+        # Newest first in array, so row i is "current" and row i + 1 "previous"
+        arr = np.asarray([row[:5] for row in candles[:lookback + 1]], dtype=np.float64)
+        
+        def pct_changes(col: np.ndarray) -> np.ndarray:
+            curr, prev = col[:-1], col[1:]
+            changes = np.divide(curr - prev, prev, out=np.zeros(lookback), where=prev > 0)
+            return changes * 100
+        
+        close_changes = pct_changes(arr[:, 2])
+        high_changes = pct_changes(arr[:, 3])
+        low_changes = pct_changes(arr[:, 4])
         
-        current_price = float(candles[0][2])
+        current_price = float(arr[0, 2])
         return close_changes, high_changes, low_changes, current_price
     
+    def _match_patterns(
+        self,
+        memory: PatternMemory,
+        table: np.ndarray,
+        close_changes: np.ndarray
+    ) -> Optional[Tuple[float, float, float, int]]:
+        """Weight-average the next-candle moves of the closest stored patterns.
+        
+        Args:
+            memory: Pattern memory to search
+            table: The memory's prediction table
+            close_changes: Recent price changes
+            
+        Returns:
+            Tuple of (close_pct, high_pct, low_pct, matched_patterns),
+            or None if no pattern matches
+        """
+        # Find similar patterns
+        distances, rows = memory.find_similar(
+            close_changes,
+            tolerance=self._tolerance,
+            top_k=10
+        )
+        
+        if not len(rows):
+            return None
+        
+        # Weight-average predictions from top matches
+        top = rows[:10]
+        weighted_close, weighted_high, weighted_low, weight_sum = weighted_predict(
+            table[top],
+            distances[:10]
+        )
+        
+        if weight_sum == 0:
+            return None
+        
+        return (
+            weighted_close / weight_sum,
+            weighted_high / weight_sum,
+            weighted_low / weight_sum,
+            len(rows)
+        )
+    
     def _generate_prediction(
         self,
         coin: str,
         timeframe: str,
-        close_changes: List[float],
-        current_price: float
+        close_changes: np.ndarray,
+        current_price: float,
+        now: Optional[datetime] = None
     ) -> Optional[Prediction]:
         """Generate price prediction for a timeframe.
         
@@ -184,134 +315,123 @@ class SignalGenerator:
             timeframe: Timeframe string
             close_changes: Recent price changes
             current_price: Current price
+            now: Prediction timestamp, defaults to the current time
             
         Returns:
             Prediction or None if no match
         """
-        memory_key = f"{coin}_{timeframe}"
-        if memory_key not in self.memories:
+        memory_key = self._memory_keys.get((coin, timeframe)) or f"{coin}_{timeframe}"
+        memory = self.memories.get(memory_key)
+        if memory is None:
             return None
         
-        memory = self.memories[memory_key]
-        
-        # Find similar patterns
-        similar = memory.find_similar(
-            close_changes,
-            tolerance=self.settings.model.distance_tolerance_pct
-        )
+        # The query only changes when the open bar moves or a new bar closes,
+        # so reuse the last match while the rounded query and memory are the same
+        query_key = np.round(close_changes, 3).tobytes()
+        mono = time.monotonic()
+        cached = self._match_cache.get(memory_key)
+        if (
+            cached is not None
+            and cached[0] == query_key
+            and cached[1] == len(memory)
+            and mono < cached[2]
+        ):
+            match = cached[3]
+        else:
+            match = self._match_patterns(
+                memory,
+                self._prediction_tables[memory_key],
+                close_changes
+            )
+            ttl = TIMEFRAME_SECONDS.get(timeframe, self.cache_ttl)
+            self._match_cache[memory_key] = (query_key, len(memory), mono + ttl, match)
         
-        if not similar:
+        if match is None:
             return None
         
-        # Weight-average predictions from top matches
-        weighted_close = 0.0
-        weighted_high = 0.0
-        weighted_low = 0.0
-        weight_sum = 0.0
-        
-        for pattern, distance in similar[:10]:
-            # Weight decays with distance and increases with pattern success
-            success_rate = pattern.success_count / max(1, pattern.hit_count)
-            weight = pattern.weight * (1.0 / (1.0 + distance)) * (1.0 + success_rate)
-            
-            # Predict next change
-            if pattern.close_changes:
-                weighted_close += pattern.close_changes[0] * weight
-            if pattern.high_changes:
-                weighted_high += pattern.high_changes[0] * weight
-            if pattern.low_changes:
-                weighted_low += pattern.low_changes[0] * weight
-            
-            weight_sum += weight
-        
-        if weight_sum == 0:
-            return None
+        predicted_close_pct, predicted_high_pct, predicted_low_pct, matched = match
         
         # Calculate predicted prices
-        predicted_close_pct = weighted_close / weight_sum
-        predicted_high_pct = weighted_high / weight_sum
-        predicted_low_pct = weighted_low / weight_sum
-        
         predicted_close = current_price * (1 + predicted_close_pct / 100)
         predicted_high = current_price * (1 + predicted_high_pct / 100)
         predicted_low = current_price * (1 + predicted_low_pct / 100)
         
         # Confidence based on number of matches and weight consensus
-        confidence = min(1.0, len(similar) / 50.0)  # Max at 50 matches
+        confidence = min(1.0, matched / 50.0)  # Max at 50 matches
         
         # Signal strength (0-7) based on predicted move magnitude
-        magnitude = abs(predicted_close_pct)
-        if magnitude < 0.25:
-            signal_strength = 0
-        elif magnitude < 0.5:
-            signal_strength = 1
-        elif magnitude < 1.0:
-            signal_strength = 2
-        elif magnitude < 2.0:
-            signal_strength = 3
-        elif magnitude < 3.0:
-            signal_strength = 4
-        elif magnitude < 5.0:
-            signal_strength = 5
-        elif magnitude < 7.0:
-            signal_strength = 6
-        else:
-            signal_strength = 7
+        signal_strength = bisect.bisect_right(_STRENGTH_BINS, abs(predicted_close_pct))
         
-        return Prediction(
+        # Every field is computed locally and already within range, so skip
+        # validation; validated construction stays at the input boundaries
+        return Prediction.model_construct(
             symbol=coin,
             timeframe=timeframe,
-            timestamp=datetime.now(),
+            timestamp=now or datetime.now(),
             predicted_close=predicted_close,
             predicted_high=predicted_high,
             predicted_low=predicted_low,
             confidence=confidence,
-            matched_patterns=len(similar),
+            matched_patterns=matched,
             signal_strength=signal_strength
         )
     
-    async def generate_signal(self, coin: str) -> Optional[NeuralSignal]:
+    async def generate_signal(
+        self,
+        coin: str,
+        now: Optional[datetime] = None
+    ) -> Optional[NeuralSignal]:
         """Generate trading signal for a coin across all timeframes.
         
         Args:
             coin: Coin symbol
+            now: Reference time shared by the signal and its predictions,
+                defaults to the current time
             
         Returns:
             Neural signal or None if no valid signal
         """
+        now = now or datetime.now()
+        
         # Check if model is fresh
-        if not self._is_model_fresh(coin):
-            logger.warning(f"Model for {coin} is stale, skipping signal generation")
+        model_fresh = self._is_model_fresh(coin, now)
+        if not model_fresh:
+            logger.warning("Model for %s is stale, skipping signal generation", coin)
             return None
         
-        symbol = f"{coin}-USDT"
+        symbol = self._symbols.get(coin) or f"{coin}-USDT"
         predictions: Dict[str, Prediction] = {}
         
-        # Generate predictions for each timeframe
-        for timeframe in self.settings.trading.timeframes:
-            candles = await self._get_recent_candles(
+        # Fetch all timeframes concurrently, then predict for each
+        timeframes = self._tf_values
+        all_candles = await asyncio.gather(*[
+            self._get_recent_candles(
                 symbol,
-                timeframe.value,
-                limit=self.settings.model.lookback_candles + 10
+                timeframe,
+                limit=self._lookback + 10
             )
-            
+            for timeframe in timeframes
+        ])
+        
+        for timeframe, candles in zip(timeframes, all_candles):
             if not candles:
                 continue
             
             close_changes, high_changes, low_changes, current_price = self._extract_current_pattern(candles)
             
-            if not close_changes:
+            if not len(close_changes):
                 continue
             
             prediction = self._generate_prediction(
                 coin,
-                timeframe.value,
+                timeframe,
                 close_changes,
-                current_price
+                current_price,
+                now
             )
             
             if prediction:
-                predictions[timeframe.value] = prediction
+                predictions[timeframe] = prediction
         
         if not predictions:
             return None
@@ -338,16 +458,18 @@ class SignalGenerator:
         avg_confidence = total_confidence / len(predictions) if predictions else 0.0
         
         # Determine overall signal type
-        if long_strength > short_strength and long_strength >= self.settings.trading.trade_start_level:
+        if long_strength > short_strength and long_strength >= self._start_level:
             signal_type = SignalType.LONG
-        elif short_strength > long_strength and short_strength >= self.settings.trading.trade_start_level:
+        elif short_strength > long_strength and short_strength >= self._start_level:
             signal_type = SignalType.SHORT
         else:
             signal_type = SignalType.NEUTRAL
         
-        return NeuralSignal(
+        # Strengths are clamped to 0-7 and signal_type is set explicitly above,
+        # so the validators have nothing left to check
+        return NeuralSignal.model_construct(
             symbol=coin,
-            timestamp=datetime.now(),
+            timestamp=now,
             long_strength=long_strength,
             short_strength=short_strength,
             predictions=predictions,
@@ -355,7 +477,7 @@ class SignalGenerator:
             confidence=avg_confidence,
             metadata={
                 'timeframes_analyzed': len(predictions),
-                'model_fresh': self._is_model_fresh(coin)
+                'model_fresh': model_fresh
             }
         )
     
@@ -367,22 +489,64 @@ class SignalGenerator:
         """
         signals = {}
         
-        for coin in self.settings.trading.coins:
+        # One timestamp for the whole batch
+        now = datetime.now()
+        
+        for coin in self._coins:
             try:
-                signal = await self.generate_signal(coin)
+                signal = await self.generate_signal(coin, now)
                 if signal:
                     signals[coin] = signal
                     logger.info(
-                        f"Signal generated for {coin}: "
-                        f"{signal.signal_type.value} "
-                        f"(L:{signal.long_strength} S:{signal.short_strength} "
-                        f"C:{signal.confidence:.2f})"
+                        "Signal generated for %s: %s (L:%d S:%d C:%.2f)",
+                        coin,
+                        signal.signal_type.value,
+                        signal.long_strength,
+                        signal.short_strength,
+                        signal.confidence
                     )
             except Exception as e:
-                logger.error(f"Error generating signal for {coin}: {e}", exc_info=True)
+                logger.error("Error generating signal for %s: %s", coin, e, exc_info=True)
         
         return signals
     
+    @staticmethod
+    def _atomic_write(path: Path, text: str) -> None:
+        """Write a file so readers never see it empty or half-written.
+        
+        Args:
+            path: Destination file
+            text: File contents
+        """
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    
+    def _write_signal_files(self, coin: str, signal: NeuralSignal) -> None:
+        """Write a coin's signal strengths, skipping files that are unchanged.
+        
+        Args:
+            coin: Coin symbol
+            signal: Signal to write
+        """
+        strengths = (signal.long_strength, signal.short_strength)
+        last = self._last_written.get(coin)
+        if last == strengths:
+            return
+        
+        coin_dir = self.settings.get_coin_dir(coin)
+        if coin_dir not in self._created_dirs:
+            coin_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(coin_dir)
+        
+        # Write signal strengths
+        if last is None or last[0] != strengths[0]:
+            self._atomic_write(coin_dir / "long_dca_signal.txt", str(strengths[0]))
+        if last is None or last[1] != strengths[1]:
+            self._atomic_write(coin_dir / "short_dca_signal.txt", str(strengths[1]))
+        
+        self._last_written[coin] = strengths
+    
     async def run_continuous(self, interval_seconds: float = 1.0) -> None:
         """Run signal generation continuously.
         
@@ -397,15 +561,7 @@ class SignalGenerator:
                 
                 # Write signals to files for backward compatibility
                 for coin, signal in signals.items():
-                    coin_dir = self.settings.get_coin_dir(coin)
-                    coin_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # Write signal strengths
-                    long_file = coin_dir / "long_dca_signal.txt"
-                    short_file = coin_dir / "short_dca_signal.txt"
-                    
-                    long_file.write_text(str(signal.long_strength))
-                    short_file.write_text(str(signal.short_strength))
+                    self._write_signal_files(coin, signal)
                 
                 await asyncio.sleep(interval_seconds)
                 
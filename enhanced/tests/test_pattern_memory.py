@@ -0,0 +1,183 @@
+"""
+Tests for PatternMemory's similarity search and model file format.
+
+The search paths (int8 prefilter, early-abandoning kernels) are checked
+against a brute-force scan, and save/load against the saved columns.
+"""
+import numpy as np
+import pytest
+
+from trainer import PatternMemory
+
+LENGTH = 24
+ROWS = 400
+
+
+def _brute_force(memory: PatternMemory, query: np.ndarray, tolerance: float):
+    """Every match's (distance, row), most similar first (ties by row)."""
+    abs_query = np.abs(query)
+    inv_scale = np.divide(100.0, abs_query, out=np.zeros_like(abs_query), where=query != 0)
+    
+    matches = []
+    for row in range(memory.n):
+        pct_diff = np.abs(memory.close_changes[row].astype(np.float64) - query) * inv_scale
+        distance = float(np.sqrt(np.mean(pct_diff ** 2)))
+        if distance <= tolerance:
+            matches.append((distance, row))
+    return sorted(matches)
+
+
+def _fill(memory: PatternMemory, rng: np.random.Generator, rows: int, base: np.ndarray) -> None:
+    """Store ``rows`` patterns scattered around ``base`` at varying spread."""
+    spread = rng.uniform(0.0, 1.5, size=(rows, 1))
+    changes = base * (1 + rng.normal(size=(rows, LENGTH)) * spread)
+    # A few exact zeros exercise the query-is-zero columns
+    changes[rng.random(changes.shape) < 0.02] = 0.0
+    
+    for i, close in enumerate(changes):
+        memory.add_row(i + 1, close, close * 1.5, close * 0.5, 1_700_000_000.0 + i)
+    memory.weight[:memory.n] = rng.uniform(0.1, 2.0, size=memory.n)
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(7)
+
+
+@pytest.fixture
+def base(rng: np.random.Generator) -> np.ndarray:
+    return rng.normal(size=LENGTH)
+
+
+@pytest.fixture
+def memory(rng: np.random.Generator, base: np.ndarray) -> PatternMemory:
+    memory = PatternMemory(max_size=ROWS)
+    _fill(memory, rng, ROWS, base)
+    return memory
+
+
+@pytest.mark.parametrize('tolerance', [25.0, 40.0, 80.0, 1000.0])
+def test_find_similar_matches_brute_force(memory, base, rng, tolerance):
+    for _ in range(5):
+        query = base * (1 + rng.normal(size=LENGTH) * 0.2)
+        query[3] = 0.0
+        expected = _brute_force(memory, query, tolerance)
+        
+        distances, rows = memory.find_similar(query, tolerance=tolerance)
+        
+        assert rows.tolist() == [row for _, row in expected]
+        np.testing.assert_allclose(distances, [d for d, _ in expected], rtol=1e-9)
+
+
+def test_find_similar_top_k_sorts_the_best_matches(memory, base):
+    expected = _brute_force(memory, base, 80.0)
+    assert len(expected) > 10
+    
+    distances, rows = memory.find_similar(base, tolerance=80.0, top_k=10)
+    
+    assert rows[:10].tolist() == [row for _, row in expected[:10]]
+    assert sorted(rows.tolist()) == sorted(row for _, row in expected)
+
+
+@pytest.mark.parametrize('tolerance', [25.0, 40.0, 80.0])
+def test_predict_matches_brute_force(memory, base, rng, tolerance):
+    for _ in range(5):
+        query = base * (1 + rng.normal(size=LENGTH) * 0.2)
+        top = _brute_force(memory, query, tolerance)[:10]
+        
+        predicted, rows = memory.predict(query, tolerance=tolerance, top_k=10)
+        
+        assert rows.tolist() == [row for _, row in top]
+        weights = np.array([memory.weight[row] / (1 + d) for d, row in top])
+        nexts = np.array([memory.close_changes[row, 0] for _, row in top], dtype=np.float64)
+        expected = float(nexts @ weights / weights.sum()) if top else 0.0
+        assert predicted == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_predict_on_empty_memory():
+    predicted, rows = PatternMemory().predict(np.ones(LENGTH))
+    
+    assert predicted == 0.0
+    assert len(rows) == 0
+
+
+def _assert_rows_equal(loaded: PatternMemory, saved: PatternMemory, pattern_hash: int) -> None:
+    """A pattern's row holds the same values in both memories."""
+    a, b = loaded.index[pattern_hash], saved.index[pattern_hash]
+    for name, _ in PatternMemory._SCALAR_COLUMNS:
+        assert getattr(loaded, name)[a] == getattr(saved, name)[b], name
+    for name in PatternMemory._VECTOR_COLUMNS + ('close_q',):
+        assert np.array_equal(getattr(loaded, name)[a], getattr(saved, name)[b]), name
+
+
+def test_dump_read_round_trip(tmp_path):
+    data = {
+        'version': 3,
+        'hashes': [1, 2, 3],
+        'floats': np.arange(12, dtype=np.float32).reshape(3, 4),
+        'ints': np.array([5, 6, 7], dtype=np.int64),
+        'bytes': np.array([-1, 0, 1], dtype=np.int8),
+    }
+    path = tmp_path / 'model.pkl'
+    with open(path, 'wb') as f:
+        PatternMemory._dump(data, f)
+    
+    loaded = PatternMemory._read(path)
+    
+    assert loaded['version'] == 3
+    assert loaded['hashes'] == [1, 2, 3]
+    for name in ('floats', 'ints', 'bytes'):
+        assert loaded[name].dtype == data[name].dtype
+        assert np.array_equal(loaded[name], data[name])
+    
+    # Mapped copy-on-write: writes never reach the file
+    loaded['ints'][0] = 99
+    assert PatternMemory._read(path)['ints'][0] == 5
+
+
+def test_save_load_round_trip(memory, tmp_path):
+    memory.touch(0, 1_800_000_000.0)
+    memory.success_count[5] = 3
+    path = tmp_path / 'model.pkl'
+    memory.save(path)
+    
+    loaded = PatternMemory(max_size=ROWS)
+    loaded.load(path)
+    
+    assert loaded.n == memory.n
+    assert loaded.hashes == memory.hashes
+    assert list(loaded.access_queue) == list(memory.access_queue)
+    for pattern_hash in memory.hashes:
+        _assert_rows_equal(loaded, memory, pattern_hash)
+    
+    # Loaded columns still drive the kernels and keep growing
+    query = memory.close_changes[10].astype(np.float64)
+    _, loaded_rows = loaded.predict(query, tolerance=40.0)
+    _, saved_rows = memory.predict(query, tolerance=40.0)
+    assert loaded_rows.tolist() == saved_rows.tolist()
+    loaded.max_size = ROWS + 1
+    assert loaded.add_row(10_000, query, query, query, 0.0) == ROWS
+
+
+def test_load_over_max_size_keeps_most_recent(memory, tmp_path):
+    # Touch the oldest rows so they become the most recently used
+    for row in range(30):
+        memory.touch(row, 1_800_000_000.0 + row)
+    path = tmp_path / 'model.pkl'
+    memory.save(path)
+    
+    loaded = PatternMemory(max_size=100)
+    loaded.load(path)
+    
+    most_recent = list(memory.access_queue)[-100:]
+    assert loaded.n == 100
+    assert list(loaded.access_queue) == most_recent
+    assert set(loaded.hashes) == set(most_recent)
+    for pattern_hash in most_recent:
+        _assert_rows_equal(loaded, memory, pattern_hash)
+    
+    # Eviction continues from the least recently used survivor
+    close = np.ones(LENGTH)
+    row = loaded.add_row(10_000, close, close, close, 0.0)
+    assert most_recent[0] not in loaded
+    assert loaded.hashes[row] == 10_000
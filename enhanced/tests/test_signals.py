@@ -0,0 +1,45 @@
+"""
+Tests for signal strength binning.
+"""
+import bisect
+import math
+
+import pytest
+
+from signals import _STRENGTH_BINS
+
+
+def _ladder(magnitude: float) -> int:
+    """The original if/elif strength ladder the bins replaced."""
+    if magnitude < 0.25:
+        return 0
+    elif magnitude < 0.5:
+        return 1
+    elif magnitude < 1.0:
+        return 2
+    elif magnitude < 2.0:
+        return 3
+    elif magnitude < 3.0:
+        return 4
+    elif magnitude < 5.0:
+        return 5
+    elif magnitude < 7.0:
+        return 6
+    else:
+        return 7
+
+
+_MAGNITUDES = sorted(
+    {edge + offset for edge in _STRENGTH_BINS for offset in (-1e-9, 0.0, 1e-9)}
+    | {0.0, 100.0, math.inf}
+)
+
+
+@pytest.mark.parametrize('magnitude', _MAGNITUDES + [math.nan])
+def test_strength_bins_match_ladder(magnitude):
+    assert bisect.bisect_right(_STRENGTH_BINS, magnitude) == _ladder(magnitude)
+
+
+def test_edges_start_the_next_strength():
+    for strength, edge in enumerate(_STRENGTH_BINS, start=1):
+        assert bisect.bisect_right(_STRENGTH_BINS, edge) == strength
@@ -7,24 +7,32 @@ Improvements over original:
 - DCA strategy with limits
 - Trailing stop-loss
 - Comprehensive logging
-- State persistence in database
+- State persistence in an append-only SQLite journal
 """
 import asyncio
 import logging
 import time
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
 
+import httpx
+import numpy as np
+from watchdog.observers import Observer
+
+import journal
+from _jit import position_size, trailing_stop_check
 from config import Settings, get_settings
 from models import (
-    DCALevel, Order, OrderSide, OrderStatus, OrderType,
-    Position, Trade, TradeTag
+    DCALevel, NeuralSignal, Order, OrderSide, OrderStatus, OrderType,
+    Position, SignalType, Trade, TradeTag
 )
+from signal_watch import LONG_SIGNAL_FILE, SHORT_SIGNAL_FILE, SignalFileHandler
 
 logger = logging.getLogger(__name__)
 
-
 class TradingEngine:
     """Core trading engine for order execution."""
     
@@ -39,18 +47,97 @@ class TradingEngine:
         # State tracking
         self.positions: Dict[str, Position] = {}
         self.orders: Dict[str, Order] = {}
-        self.dca_history: Dict[str, List[datetime]] = {}
-        self.trailing_peaks: Dict[str, float] = {}
+        # DCA buy times per symbol (monotonic clock), oldest first
+        self.dca_history: Dict[str, Deque[float]] = defaultdict(deque)
+        
+        # Last signal file reads per coin: (long mtime_ns, short mtime_ns,
+        # long strength, short strength)
+        self._sig_cache: Dict[str, Tuple[int, int, int, int]] = {}
+        
+        # Signal file reads get their own small pool so they never queue
+        # behind other work in the loop's default executor
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="signal-io")
+        
+        # Local account ledger: refreshed from the exchange at most every
+        # account_refresh_seconds and adjusted on fills in between
+        self._ledger: Optional[Dict] = None
+        self._last_account_refresh = float('-inf')
+        self.account_refresh_seconds = 60.0
+        
+        # Latest signal per coin; kept current by the file watcher once it runs
+        self.signals: Dict[str, NeuralSignal] = {}
+        self._signal_observer: Optional[Observer] = None
+        
+        # Configured coins and their trading symbols, formatted once
+        self._coins = tuple(self.settings.trading.coins)
+        self._coin_to_symbol: Dict[str, str] = {coin: f"{coin}-USD" for coin in self._coins}
+        
+        # Per-symbol position inputs, one row per configured coin, so each
+        # tick's P&L is computed for every held symbol at once
+        self._symbols = [self._coin_to_symbol[coin] for coin in self._coins]
+        self._sym_index: Dict[str, int] = {symbol: i for i, symbol in enumerate(self._symbols)}
+        self._qty = np.zeros(len(self._symbols))
+        self._cost = np.zeros(len(self._symbols))
+        self._price = np.zeros(len(self._symbols))
+        self._peaks = np.full(len(self._symbols), np.nan)  # trailing peak, NaN if unset
+        
+        # DCA times and trailing peaks survive restarts through an append
+        # log, replayed here
+        self._journal = journal.StateJournal(self.settings.data_dir / "trader_state.db")
+        self._restore_state()
+        # Restored state is checked against the first positions fetch
+        self._state_reconciled = False
+        # Events of the current tick; written from _io_pool once it's done
+        # so SQLite never runs on the event loop
+        self._journal_buffer: List[Tuple[str, str, Optional[float]]] = []
+        
+        # Streamed quotes by symbol and when each arrived (monotonic clock)
+        self.latest_quotes: Dict[str, Dict] = {}
+        self.last_update_ts: Dict[str, float] = {}
+        self.quote_max_age = 5.0  # seconds before falling back to REST
+        self._quote_task: Optional[asyncio.Task] = None
+        
+        # Longest wait between retries after failed trading iterations
+        self.max_error_backoff = 30.0
+        
+        # Wakes the trading loop before its idle timeout when a held
+        # symbol's price moves by more than wake_move_frac or a signal changes
+        self._wake = asyncio.Event()
+        self.wake_move_frac = 0.002
+        
+        # DCA trigger ratios and size multipliers depend only on settings;
+        # the levels built from them are cached per symbol by cost basis,
+        # along with their trigger prices and triggered flags as arrays
+        trading = self.settings.trading
+        self._dca_trigger_ratios = [1 + pct / 100.0 for pct in trading.dca_levels]
+        self._dca_multipliers = [trading.dca_multiplier ** i for i in range(len(trading.dca_levels))]
+        self._dca_level_cache: Dict[
+            str, Tuple[float, List[DCALevel], np.ndarray, np.ndarray]
+        ] = {}
+        
+        # Settings-derived constants used every tick, pre-scaled to fractions
+        risk = self.settings.risk
+        self._base_pct = trading.start_allocation_pct / 100.0
+        if risk.use_kelly_criterion:
+            # Simplified Kelly: f = (bp - q) / b
+            # For now, use conservative fixed fraction
+            self._base_pct *= risk.kelly_fraction
+        self._max_pos_frac = risk.max_position_size_pct / 100.0
+        self._trailing_gap_frac = 1 - trading.trailing_gap_pct / 100.0
+        self._pm_no_dca = trading.pm_start_pct_no_dca
+        self._pm_with_dca = trading.pm_start_pct_with_dca
+        self._start_level = trading.trade_start_level
+        self._max_dca_per_24h = trading.max_dca_buys_per_24h
         
         # Initialize based on trading mode
         if self.settings.trading_mode.value == "paper":
             logger.info("Running in PAPER TRADING mode (simulated)")
             from exchange.paper import PaperExchange
-            self.exchange = PaperExchange(settings)
+            self.exchange = PaperExchange(self.settings)
         elif self.settings.exchange.value == "robinhood":
             logger.info("Running in LIVE mode with Robinhood")
             from exchange.robinhood import RobinhoodExchange
-            self.exchange = RobinhoodExchange(settings)
+            self.exchange = RobinhoodExchange(self.settings)
         else:
             raise ValueError(f"Unsupported exchange: {self.settings.exchange}")
     
@@ -58,6 +145,38 @@ class TradingEngine:
         """Get current account balance and buying power."""
         return await self.exchange.get_account()
     
+    async def _get_account(self) -> Dict:
+        """Get the account from the local ledger, refreshing it when due.
+        
+        Returns:
+            Account dict with 'total_value' and 'buying_power'
+        """
+        now = time.monotonic()
+        if self._ledger is None or now - self._last_account_refresh > self.account_refresh_seconds:
+            self._ledger = dict(await self.get_account_balance())
+            self._last_account_refresh = now
+        return self._ledger
+    
+    def _apply_fill(self, order: Order, notional: float) -> None:
+        """Move an order's cash into or out of the ledger's buying power.
+        
+        Args:
+            order: Placed order
+            notional: Requested dollar amount, used if fill details are missing
+        """
+        if self._ledger is None:
+            return
+        
+        if order.filled_quantity and order.average_fill_price:
+            cash = order.filled_quantity * order.average_fill_price
+        else:
+            cash = notional
+        
+        if order.side == OrderSide.BUY:
+            self._ledger['buying_power'] -= cash
+        else:
+            self._ledger['buying_power'] += cash
+    
     async def get_current_positions(self) -> Dict[str, Position]:
         """Get all current positions."""
         return await self.exchange.get_positions()
@@ -66,6 +185,69 @@ class TradingEngine:
         """Get current bid/ask for a symbol."""
         return await self.exchange.get_quote(symbol)
     
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get bid/ask for several symbols, in one request where supported.
+        
+        Args:
+            symbols: Trading symbols
+            
+        Returns:
+            Quote by symbol
+        """
+        # Fresh streamed quotes cost nothing; only fetch the rest
+        now = time.monotonic()
+        quotes = {}
+        missing = []
+        for symbol in symbols:
+            if now - self.last_update_ts.get(symbol, float('-inf')) <= self.quote_max_age:
+                quotes[symbol] = self.latest_quotes[symbol]
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return quotes
+        
+        get_batch = getattr(self.exchange, 'get_quotes', None)
+        if get_batch is not None:
+            quotes.update(await get_batch(missing))
+        else:
+            fetched = await asyncio.gather(*[self.get_quote(symbol) for symbol in missing])
+            quotes.update(zip(missing, fetched))
+        
+        return quotes
+    
+    async def _quote_stream(self) -> None:
+        """Keep ``latest_quotes`` updated from the exchange's quote stream.
+        
+        Reconnects after errors; returns at once if the exchange has no
+        stream, leaving quotes to REST.
+        """
+        subscribe = getattr(self.exchange, 'subscribe_l1', None)
+        if subscribe is None:
+            return
+        
+        symbols = self._symbols
+        
+        while True:
+            try:
+                async for symbol, quote in subscribe(symbols):
+                    self.latest_quotes[symbol] = quote
+                    self.last_update_ts[symbol] = time.monotonic()
+                    
+                    # Compare against the price the loop last acted on
+                    i = self._sym_index.get(symbol)
+                    if i is not None:
+                        last = self._price[i]
+                        if last > 0 and abs(quote['ask'] - last) > last * self.wake_move_frac:
+                            self._wake.set()
+                logger.warning("Quote stream closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Quote stream error: {e}, reconnecting")
+            
+            await asyncio.sleep(5)
+    
     def _should_start_trade(self, coin: str, signals: Dict) -> bool:
         """Determine if we should start a new trade.
         
@@ -81,12 +263,12 @@ class TradingEngine:
             return False
         
         # Check signal strength meets threshold
-        start_level = self.settings.trading.trade_start_level
+        start_level = self._start_level
         
         if signal.long_strength >= start_level and signal.short_strength == 0:
             logger.info(
-                f"{coin}: Start signal detected "
-                f"(long={signal.long_strength}, short={signal.short_strength})"
+                "%s: Start signal detected (long=%d, short=%d)",
+                coin, signal.long_strength, signal.short_strength
             )
             return True
         
@@ -110,31 +292,79 @@ class TradingEngine:
         Returns:
             Dollar amount to invest
         """
-        # Base allocation percentage
-        base_pct = self.settings.trading.start_allocation_pct / 100.0
+        # Base size (Kelly fraction already applied if enabled), scaled for
+        # DCA, capped by the risk limit and floored at $1
+        return position_size(
+            account_value,
+            self._base_pct,
+            self._max_pos_frac,
+            dca_multiplier if is_dca else 1.0
+        )
+    
+    def _restore_state(self) -> None:
+        """Rebuild DCA history and trailing peaks from the journal.
         
-        # Apply Kelly Criterion if enabled
-        if self.settings.risk.use_kelly_criterion:
-            # Simplified Kelly: f = (bp - q) / b
-            # For now, use conservative fixed fraction
-            kelly_fraction = self.settings.risk.kelly_fraction
-            base_pct *= kelly_fraction
+        DCA times are journaled on the wall clock and mapped back onto the
+        monotonic clock; those outside the 24h window are dropped. The log
+        is then compacted to just the restored state.
+        """
+        wall_to_mono = time.monotonic() - time.time()
+        cutoff = time.time() - 86400
+        dca_times: Dict[str, List[float]] = defaultdict(list)
         
-        # Calculate base size
-        position_size = account_value * base_pct
+        for event_type, symbol, value in self._journal.replay():
+            i = self._sym_index.get(symbol)
+            if i is None:
+                continue
+            if event_type == journal.DCA:
+                dca_times[symbol].append(value)
+            elif event_type == journal.PEAK:
+                self._peaks[i] = value
+            elif event_type == journal.CLOSE:
+                dca_times.pop(symbol, None)
+                self._peaks[i] = np.nan
         
-        # Apply DCA multiplier
-        if is_dca:
-            position_size *= dca_multiplier
+        snapshot = []
+        for symbol, times in dca_times.items():
+            recent = [t for t in times if t > cutoff]
+            if recent:
+                self.dca_history[symbol] = deque(t + wall_to_mono for t in recent)
+                snapshot.extend((journal.DCA, symbol, t) for t in recent)
+        for symbol, peak in zip(self._symbols, self._peaks):
+            if not np.isnan(peak):
+                snapshot.append((journal.PEAK, symbol, float(peak)))
         
-        # Apply risk limits
-        max_position = account_value * (self.settings.risk.max_position_size_pct / 100.0)
-        position_size = min(position_size, max_position)
+        self._journal.compact(snapshot)
+        if snapshot:
+            logger.info("Restored %d state events from journal", len(snapshot))
+    
+    def _reconcile_state(self, positions: Dict[str, Position]) -> None:
+        """Drop restored state of symbols that no longer hold a position.
+        
+        Journaled state can outlive its position: paper positions don't
+        survive a restart and live ones can be closed outside the engine.
+        
+        Args:
+            positions: Current positions by symbol
+        """
+        for symbol in self._symbols:
+            if symbol not in positions:
+                self._clear_position_state(symbol)
+        self._state_reconciled = True
+    
+    def _clear_position_state(self, symbol: str) -> None:
+        """Forget a symbol's trailing peak and DCA history, if it has any.
         
-        # Minimum position size
-        position_size = max(position_size, 1.0)
+        Args:
+            symbol: Trading symbol
+        """
+        i = self._sym_index[symbol]
+        if np.isnan(self._peaks[i]) and not self.dca_history.get(symbol):
+            return
         
-        return position_size
+        self._peaks[i] = np.nan
+        self.dca_history.pop(symbol, None)
+        self._journal_buffer.append((journal.CLOSE, symbol, None))
     
     def _get_dca_levels(self, position: Position) -> List[DCALevel]:
         """Get DCA levels for a position.
@@ -145,20 +375,46 @@ class TradingEngine:
         Returns:
             List of DCA levels with prices
         """
-        levels = []
+        return self._get_dca_triggers(position)[0]
+    
+    def _get_dca_triggers(
+        self,
+        position: Position
+    ) -> Tuple[List[DCALevel], np.ndarray, np.ndarray]:
+        """Get DCA levels for a position along with their trigger arrays.
         
-        for i, level_pct in enumerate(self.settings.trading.dca_levels):
-            trigger_price = position.avg_cost_basis * (1 + level_pct / 100.0)
+        Args:
+            position: Current position
             
+        Returns:
+            Tuple of (levels, trigger_prices, triggered), where the arrays
+            hold each level's trigger price and triggered flag
+        """
+        avg_cost_basis = position.avg_cost_basis
+        cached = self._dca_level_cache.get(position.symbol)
+        if cached is not None and cached[0] == avg_cost_basis:
+            return cached[1:]
+        
+        levels = []
+        
+        for i, (level_pct, ratio, multiplier) in enumerate(zip(
+            self.settings.trading.dca_levels,
+            self._dca_trigger_ratios,
+            self._dca_multipliers
+        )):
             levels.append(DCALevel(
                 level=i,
                 trigger_pct=level_pct,
                 triggered=False,
-                trigger_price=trigger_price,
-                position_size_multiplier=self.settings.trading.dca_multiplier ** i
+                trigger_price=avg_cost_basis * ratio,
+                position_size_multiplier=multiplier
             ))
         
-        return levels
+        trigger_prices = np.array([level.trigger_price for level in levels], dtype=np.float64)
+        triggered = np.array([level.triggered for level in levels], dtype=bool)
+        
+        self._dca_level_cache[position.symbol] = (avg_cost_basis, levels, trigger_prices, triggered)
+        return levels, trigger_prices, triggered
     
     def _should_dca(
         self,
@@ -178,31 +434,29 @@ class TradingEngine:
         """
         # Check 24h DCA limit
         symbol = position.symbol
-        recent_dcas = self.dca_history.get(symbol, [])
-        cutoff = datetime.now() - timedelta(hours=24)
-        recent_dcas = [t for t in recent_dcas if t > cutoff]
+        recent_dcas = self.dca_history[symbol]
+        cutoff = time.monotonic() - 86400
+        while recent_dcas and recent_dcas[0] <= cutoff:
+            recent_dcas.popleft()
         
-        if len(recent_dcas) >= self.settings.trading.max_dca_buys_per_24h:
-            logger.debug(f"{symbol}: DCA limit reached ({len(recent_dcas)} in 24h)")
+        if len(recent_dcas) >= self._max_dca_per_24h:
+            logger.debug("%s: DCA limit reached (%d in 24h)", symbol, len(recent_dcas))
             return None
         
         # Get DCA levels
-        dca_levels = self._get_dca_levels(position)
+        dca_levels, trigger_prices, triggered = self._get_dca_triggers(position)
         
-        # Find next untriggered level
-        for level in dca_levels:
-            if level.triggered:
-                continue
-            
-            # Check if price hit trigger
-            if current_price <= level.trigger_price:
-                logger.info(
-                    f"{symbol}: DCA level {level.level} triggered "
-                    f"(price ${current_price:.2f} <= ${level.trigger_price:.2f})"
-                )
-                return level
+        # Find the first untriggered level whose trigger price was hit
+        hits = ~triggered & (current_price <= trigger_prices)
+        if not hits.any():
+            return None
         
-        return None
+        level = dca_levels[int(hits.argmax())]
+        logger.info(
+            "%s: DCA level %d triggered (price $%.2f <= $%.2f)",
+            symbol, level.level, current_price, level.trigger_price
+        )
+        return level
     
     def _should_take_profit(
         self,
@@ -220,37 +474,29 @@ class TradingEngine:
         """
         symbol = position.symbol
         
-        # Track peak price for trailing
-        if symbol not in self.trailing_peaks:
-            self.trailing_peaks[symbol] = current_price
-        else:
-            self.trailing_peaks[symbol] = max(self.trailing_peaks[symbol], current_price)
-        
-        peak = self.trailing_peaks[symbol]
-        
-        # Calculate profit percentages
         unrealized_pnl_pct = position.unrealized_pnl_pct
         
         # Determine starting profit margin based on DCA count
-        if position.dca_count == 0:
-            start_pm = self.settings.trading.pm_start_pct_no_dca
-        else:
-            start_pm = self.settings.trading.pm_start_pct_with_dca
+        start_pm = self._pm_no_dca if position.dca_count == 0 else self._pm_with_dca
         
-        # Check if we're in profit territory
-        if unrealized_pnl_pct < start_pm:
-            return False
-        
-        # Calculate trailing stop price
-        trailing_gap_pct = self.settings.trading.trailing_gap_pct
-        trailing_stop = peak * (1 - trailing_gap_pct / 100.0)
+        # Track peak price for trailing; a hit needs the position in profit
+        # territory and the price at or below the trailing stop
+        i = self._sym_index[symbol]
+        peak, trailing_stop, hit = trailing_stop_check(
+            current_price,
+            self._peaks[i],
+            unrealized_pnl_pct,
+            start_pm,
+            self._trailing_gap_frac
+        )
+        if peak != self._peaks[i] and not np.isnan(peak):
+            self._journal_buffer.append((journal.PEAK, symbol, peak))
+        self._peaks[i] = peak
         
-        # Check if price fell below trailing stop
-        if current_price <= trailing_stop:
+        if hit:
             logger.info(
-                f"{symbol}: Trailing stop hit "
-                f"(price ${current_price:.2f} <= stop ${trailing_stop:.2f}, "
-                f"peak ${peak:.2f}, profit {unrealized_pnl_pct:.2f}%)"
+                "%s: Trailing stop hit (price $%.2f <= stop $%.2f, peak $%.2f, profit %.2f%%)",
+                symbol, current_price, trailing_stop, peak, unrealized_pnl_pct
             )
             return True
         
@@ -281,159 +527,505 @@ class TradingEngine:
                 notional=notional
             )
             
-            order.tag = tag
-            self.orders[order.order_id] = order
-            
-            logger.info(
-                f"Order placed: {side.value} ${notional:.2f} {symbol} "
-                f"(tag: {tag.value if tag else 'none'})"
-            )
-            
+            self._record_order(order, notional, tag)
             return order
             
         except Exception as e:
             logger.error(f"Failed to place order: {e}", exc_info=True)
+            self._last_account_refresh = float('-inf')  # resync the ledger
             return None
     
+    async def place_orders(
+        self,
+        requests: List[Tuple[str, OrderSide, float, Optional[TradeTag]]]
+    ) -> List[Optional[Order]]:
+        """Place several market orders, in one exchange call where supported.
+        
+        Args:
+            requests: (symbol, side, notional, tag) for each order
+            
+        Returns:
+            Order object, or None if it failed, for each request
+        """
+        if not requests:
+            return []
+        
+        place_batch = getattr(self.exchange, 'place_market_orders', None)
+        if place_batch is None:
+            return await asyncio.gather(*[
+                self.place_order(symbol, side, notional, tag)
+                for symbol, side, notional, tag in requests
+            ])
+        
+        try:
+            results = await place_batch([
+                (symbol, side, notional) for symbol, side, notional, _ in requests
+            ])
+        except Exception as e:
+            logger.error(f"Failed to place orders: {e}", exc_info=True)
+            self._last_account_refresh = float('-inf')  # resync the ledger
+            return [None] * len(requests)
+        
+        orders: List[Optional[Order]] = []
+        for (_, _, notional, tag), result in zip(requests, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to place order: {result}")
+                self._last_account_refresh = float('-inf')  # resync the ledger
+                orders.append(None)
+            else:
+                self._record_order(result, notional, tag)
+                orders.append(result)
+        
+        return orders
+    
+    def _record_order(
+        self,
+        order: Order,
+        notional: float,
+        tag: Optional[TradeTag]
+    ) -> None:
+        """Tag and track a placed order."""
+        order.tag = tag
+        self.orders[order.order_id] = order
+        self._apply_fill(order, notional)
+        
+        logger.info(
+            "Order placed: %s $%.2f %s (tag: %s)",
+            order.side.value, notional, order.symbol, tag.value if tag else 'none'
+        )
+    
+    async def _process_coin(
+        self,
+        coin: str,
+        positions: Dict[str, Position],
+        quotes: Dict[str, Dict],
+        total_value: float,
+        buying_power: float,
+        signals: Dict
+    ) -> Optional[Tuple[str, OrderSide, float, TradeTag]]:
+        """Decide this tick's order for one coin.
+        
+        Args:
+            coin: Coin symbol
+            positions: Current positions by symbol
+            quotes: Current quotes for the held symbols
+            total_value: Total account value
+            buying_power: Available cash
+            signals: Neural network signals
+            
+        Returns:
+            (symbol, side, notional, tag) of the order to place, or None
+        """
+        symbol = self._coin_to_symbol[coin]
+        
+        # Check if we have a position
+        if symbol in positions:
+            position = positions[symbol]
+            
+            # Get current price; batch-quoted positions are already repriced
+            quote = quotes.get(symbol)
+            if quote is None:
+                quote = await self.get_quote(symbol)
+                self._reprice_positions({symbol: position}, {symbol: quote})
+            current_price = quote['ask']
+            
+            # Check for take profit
+            if self._should_take_profit(position, current_price):
+                self._clear_position_state(symbol)
+                
+                return (symbol, OrderSide.SELL, position.market_value, TradeTag.TRAILING_STOP)
+            
+            # Check for DCA opportunity
+            dca_level = self._should_dca(position, current_price, signals)
+            if dca_level:
+                dca_size = self._calculate_position_size(
+                    account_value=total_value,
+                    symbol=symbol,
+                    is_dca=True,
+                    dca_multiplier=dca_level.position_size_multiplier
+                )
+                
+                if dca_size <= buying_power:
+                    # Record DCA time
+                    self.dca_history[symbol].append(time.monotonic())
+                    self._journal_buffer.append((journal.DCA, symbol, time.time()))
+                    
+                    return (symbol, OrderSide.BUY, dca_size, TradeTag.DCA)
+        
+        else:
+            # No position - check for entry signal
+            if self._should_start_trade(coin, signals):
+                position_size = self._calculate_position_size(
+                    account_value=total_value,
+                    symbol=symbol,
+                    is_dca=False
+                )
+                
+                if position_size <= buying_power:
+                    # A position closed outside the engine may have left
+                    # its peak behind; the new one trails from scratch
+                    self._clear_position_state(symbol)
+                    return (symbol, OrderSide.BUY, position_size, TradeTag.ENTRY)
+        
+        return None
+    
+    def _reprice_positions(
+        self,
+        positions: Dict[str, Position],
+        quotes: Dict[str, Dict]
+    ) -> None:
+        """Update quoted positions' price and P&L in one vectorized pass.
+        
+        The exchange returns positions already priced, so a position is
+        only written back if its quote differs from that price.
+        
+        Args:
+            positions: Current positions by symbol
+            quotes: Current quotes by symbol
+        """
+        rows = []
+        symbols = []
+        for symbol, quote in quotes.items():
+            i = self._sym_index.get(symbol)
+            position = positions.get(symbol)
+            if i is None or position is None:
+                continue
+            
+            self._qty[i] = position.quantity
+            self._cost[i] = position.avg_cost_basis
+            self._price[i] = quote['ask']
+            rows.append(i)
+            symbols.append(symbol)
+        
+        if not rows:
+            return
+        
+        rows = np.asarray(rows)
+        quantity = self._qty[rows]
+        price = self._price[rows]
+        cost_basis = quantity * self._cost[rows]
+        market_value = quantity * price
+        unrealized_pnl = market_value - cost_basis
+        unrealized_pnl_pct = np.divide(
+            unrealized_pnl * 100,
+            cost_basis,
+            out=np.zeros(len(rows)),
+            where=cost_basis > 0
+        )
+        
+        for symbol, px, value, pnl, pnl_pct in zip(
+            symbols,
+            price.tolist(),
+            market_value.tolist(),
+            unrealized_pnl.tolist(),
+            unrealized_pnl_pct.tolist()
+        ):
+            position = positions[symbol]
+            if px != position.current_price:
+                position.current_price = px
+                position.market_value = value
+                position.unrealized_pnl = pnl
+                position.unrealized_pnl_pct = pnl_pct
+    
     async def manage_trades(self):
         """Main trading loop."""
         logger.info("Starting trading engine...")
         
+        if self._quote_task is None:
+            self._quote_task = asyncio.create_task(self._quote_stream())
+        
+        if self._signal_observer is None:
+            await self._start_signal_watcher()
+        
+        try:
+            await self._trade_loop()
+        finally:
+            if self._quote_task is not None:
+                self._quote_task.cancel()
+                try:
+                    await self._quote_task
+                except asyncio.CancelledError:
+                    pass
+                self._quote_task = None
+            self._stop_signal_watcher()
+            # Let an in-flight journal write finish before the last one
+            self._io_pool.shutdown(wait=True)
+            self._journal.extend(self._journal_buffer)
+            self._journal_buffer = []
+            self._journal.close()
+    
+    async def _flush_journal(self) -> None:
+        """Write the buffered journal events on the I/O pool."""
+        if not self._journal_buffer:
+            return
+        
+        events, self._journal_buffer = self._journal_buffer, []
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._io_pool, self._journal.extend, events)
+    
+    async def _trade_loop(self) -> None:
+        """Run trading iterations until cancelled.
+        
+        Failed iterations are retried with exponential backoff, capped at
+        max_error_backoff seconds and reset by the next clean iteration.
+        """
+        backoff = 1.0
+        seen_errors = set()
+        
         while True:
             try:
-                # Get account status
-                account = await self.get_account_balance()
+                # Account, positions and signals are independent fetches
+                account, positions, signals = await asyncio.gather(
+                    self._get_account(),
+                    self.get_current_positions(),
+                    self._read_signals()
+                )
                 total_value = account['total_value']
                 buying_power = account['buying_power']
-                
-                # Get current positions
-                positions = await self.get_current_positions()
                 self.positions = positions
+                if not self._state_reconciled:
+                    self._reconcile_state(positions)
                 
-                # Read neural signals
-                signals = await self._read_signals()
+                # Quote every held coin from the stream, or one request
+                coins = self._coins
+                quotes = await self.get_quotes([
+                    symbol for symbol in self._symbols if symbol in positions
+                ])
+                self._reprice_positions(positions, quotes)
                 
-                # Process each configured coin
-                for coin in self.settings.trading.coins:
-                    symbol = f"{coin}-USD"
-                    
-                    # Check if we have a position
-                    if symbol in positions:
-                        position = positions[symbol]
-                        
-                        # Get current price
-                        quote = await self.get_quote(symbol)
-                        current_price = quote['ask']
-                        
-                        # Update position with current price
-                        position.current_price = current_price
-                        position.market_value = position.quantity * current_price
-                        position.unrealized_pnl = position.market_value - (position.quantity * position.avg_cost_basis)
-                        position.unrealized_pnl_pct = (position.unrealized_pnl / (position.quantity * position.avg_cost_basis)) * 100
-                        
-                        # Check for take profit
-                        if self._should_take_profit(position, current_price):
-                            await self.place_order(
-                                symbol=symbol,
-                                side=OrderSide.SELL,
-                                notional=position.market_value,
-                                tag=TradeTag.TRAILING_STOP
-                            )
-                            
-                            # Clear tracking
-                            self.trailing_peaks.pop(symbol, None)
-                            self.dca_history.pop(coin, None)
-                            
-                            continue
-                        
-                        # Check for DCA opportunity
-                        dca_level = self._should_dca(position, current_price, signals)
-                        if dca_level:
-                            dca_size = self._calculate_position_size(
-                                account_value=total_value,
-                                symbol=symbol,
-                                is_dca=True,
-                                dca_multiplier=dca_level.position_size_multiplier
-                            )
-                            
-                            if dca_size <= buying_power:
-                                await self.place_order(
-                                    symbol=symbol,
-                                    side=OrderSide.BUY,
-                                    notional=dca_size,
-                                    tag=TradeTag.DCA
-                                )
-                                
-                                # Record DCA time
-                                if coin not in self.dca_history:
-                                    self.dca_history[coin] = []
-                                self.dca_history[coin].append(datetime.now())
-                    
-                    else:
-                        # No position - check for entry signal
-                        if self._should_start_trade(coin, signals):
-                            position_size = self._calculate_position_size(
-                                account_value=total_value,
-                                symbol=symbol,
-                                is_dca=False
-                            )
-                            
-                            if position_size <= buying_power:
-                                await self.place_order(
-                                    symbol=symbol,
-                                    side=OrderSide.BUY,
-                                    notional=position_size,
-                                    tag=TradeTag.ENTRY
-                                )
+                # Evaluate every configured coin concurrently
+                decisions = await asyncio.gather(
+                    *[
+                        self._process_coin(
+                            coin, positions, quotes, total_value, buying_power, signals
+                        )
+                        for coin in coins
+                    ],
+                    return_exceptions=True
+                )
+                
+                requests = []
+                for coin, decision in zip(coins, decisions):
+                    if isinstance(decision, Exception):
+                        logger.error("Error processing %s: %s", coin, decision, exc_info=decision)
+                    elif decision is not None:
+                        requests.append(decision)
+                
+                # Submit this tick's orders together
+                await self.place_orders(requests)
+                await self._flush_journal()
                 
                 # Log status
                 logger.info(
-                    f"Status: ${total_value:.2f} total, "
-                    f"${buying_power:.2f} available, "
-                    f"{len(positions)} positions"
+                    "Status: $%.2f total, $%.2f available, %d positions",
+                    total_value, buying_power, len(positions)
                 )
                 
-                # Sleep before next iteration
-                await asyncio.sleep(self.settings.signal_check_seconds)
+                # Wait for a price move or signal change
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._idle_timeout())
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                backoff = 1.0
+                continue
                 
+            except (asyncio.TimeoutError, httpx.HTTPError, OSError) as e:
+                # Network trouble is expected now and then; no traceback
+                logger.warning("Transient trading loop error: %s", e)
             except Exception as e:
-                logger.error(f"Error in trading loop: {e}", exc_info=True)
-                await asyncio.sleep(5)
+                # Full traceback only the first time each error type appears
+                first = type(e) not in seen_errors
+                seen_errors.add(type(e))
+                logger.error("Error in trading loop: %s", e, exc_info=first)
+            
+            backoff = min(backoff * 2, self.max_error_backoff)
+            await asyncio.sleep(backoff)
+    
+    def _idle_timeout(self) -> float:
+        """Longest wait for a wake-up before the next trading iteration.
+        
+        Only a running signal watcher and a fresh quote stream for every
+        held symbol wake the loop on changes; without them the loop polls
+        every signal_check_seconds.
+        
+        Returns:
+            Timeout in seconds
+        """
+        if self._signal_observer is None:
+            return self.settings.signal_check_seconds
+        
+        now = time.monotonic()
+        for symbol in self.positions:
+            if now - self.last_update_ts.get(symbol, float('-inf')) > self.quote_max_age:
+                return self.settings.signal_check_seconds
+        
+        return self.settings.max_idle_seconds
+    
+    async def _start_signal_watcher(self) -> None:
+        """Load current signals, then watch the signal files for changes."""
+        await self._load_signals()
+        
+        try:
+            coins_by_dir = {self.settings.get_coin_dir(coin): coin for coin in self._coins}
+            observer = Observer()
+            observer.schedule(
+                SignalFileHandler(coins_by_dir, self._refresh_signal, asyncio.get_running_loop()),
+                str(self.settings.data_dir),
+                recursive=True
+            )
+            observer.start()
+        except Exception as e:
+            logger.warning(f"Signal file watcher unavailable, polling instead: {e}")
+            return
+        
+        self._signal_observer = observer
+    
+    def _stop_signal_watcher(self) -> None:
+        """Stop the signal file watcher if it is running."""
+        if self._signal_observer is not None:
+            self._signal_observer.stop()
+            self._signal_observer.join()
+            self._signal_observer = None
+    
+    async def _refresh_signal(self, coin: str) -> None:
+        """Re-read one coin's signal files after a change.
+        
+        Args:
+            coin: Coin symbol
+        """
+        loop = asyncio.get_running_loop()
+        strengths = await loop.run_in_executor(self._io_pool, self._read_coin_signal, coin)
+        signal = self._make_signal(coin, strengths, datetime.now())
+        if signal is self.signals.get(coin):
+            return
+        
+        if signal is None:
+            self.signals.pop(coin, None)
+        else:
+            self.signals[coin] = signal
+        self._wake.set()
     
     async def _read_signals(self) -> Dict:
+        """Get the current neural network signals.
+        
+        Served from memory while the file watcher runs, read from the
+        signal files otherwise.
+        
+        Returns:
+            Dictionary of signals by coin
+        """
+        if self._signal_observer is not None:
+            return dict(self.signals)
+        return await self._load_signals()
+    
+    async def _load_signals(self) -> Dict:
         """Read neural network signals from files (backward compatible).
         
         Returns:
             Dictionary of signals by coin
         """
+        coins = self._coins
+        
+        # File IO runs off the event loop, all coins at once
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(self._io_pool, self._read_coin_signal, coin)
+            for coin in coins
+        ])
+        
         signals = {}
+        now = datetime.now()
         
-        for coin in self.settings.trading.coins:
-            try:
-                coin_dir = self.settings.get_coin_dir(coin)
-                
-                long_file = coin_dir / "long_dca_signal.txt"
-                short_file = coin_dir / "short_dca_signal.txt"
-                
-                if long_file.exists() and short_file.exists():
-                    long_strength = int(long_file.read_text().strip())
-                    short_strength = int(short_file.read_text().strip())
-                    
-                    from models import NeuralSignal, SignalType
-                    
-                    signals[coin] = NeuralSignal(
-                        symbol=coin,
-                        timestamp=datetime.now(),
-                        long_strength=long_strength,
-                        short_strength=short_strength,
-                        predictions={},
-                        signal_type=SignalType.LONG if long_strength > short_strength else SignalType.SHORT,
-                        confidence=0.5
-                    )
-            except Exception as e:
-                logger.error(f"Error reading signals for {coin}: {e}")
+        for coin, strengths in zip(coins, results):
+            signal = self._make_signal(coin, strengths, now)
+            if signal is not None:
+                signals[coin] = signal
         
+        self.signals = signals
         return signals
+    
+    def _make_signal(
+        self,
+        coin: str,
+        strengths: Optional[Tuple[int, int]],
+        now: datetime
+    ) -> Optional[NeuralSignal]:
+        """Build a signal from strengths read from the signal files.
+        
+        Signals are immutable, so the coin's current signal is returned
+        as is when its strengths haven't changed.
+        
+        Args:
+            coin: Coin symbol
+            strengths: (long_strength, short_strength), or None if unread
+            now: Signal timestamp
+            
+        Returns:
+            Neural signal, or None if there are no valid strengths
+        """
+        if strengths is None:
+            return None
+        
+        long_strength, short_strength = strengths
+        
+        current = self.signals.get(coin)
+        if (
+            current is not None
+            and current.long_strength == long_strength
+            and current.short_strength == short_strength
+        ):
+            return current
+        
+        try:
+            return NeuralSignal(
+                symbol=coin,
+                timestamp=now,
+                long_strength=long_strength,
+                short_strength=short_strength,
+                predictions={},
+                signal_type=SignalType.LONG if long_strength > short_strength else SignalType.SHORT,
+                confidence=0.5
+            )
+        except Exception as e:
+            logger.error(f"Error reading signals for {coin}: {e}")
+            return None
+    
+    def _read_coin_signal(self, coin: str) -> Optional[Tuple[int, int]]:
+        """Read a coin's signal strengths, re-reading only changed files.
+        
+        Args:
+            coin: Coin symbol
+            
+        Returns:
+            Tuple of (long_strength, short_strength), or None if either
+            file is missing or unreadable
+        """
+        try:
+            coin_dir = self.settings.get_coin_dir(coin)
+            
+            long_file = coin_dir / LONG_SIGNAL_FILE
+            short_file = coin_dir / SHORT_SIGNAL_FILE
+            
+            try:
+                long_mtime = long_file.stat().st_mtime_ns
+                short_mtime = short_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                return None
+            
+            cached = self._sig_cache.get(coin)
+            if cached is not None and cached[0] == long_mtime and cached[1] == short_mtime:
+                return cached[2], cached[3]
+            
+            long_strength = int(long_file.read_text().strip())
+            short_strength = int(short_file.read_text().strip())
+            
+            self._sig_cache[coin] = (long_mtime, short_mtime, long_strength, short_strength)
+            return long_strength, short_strength
+            
+        except Exception as e:
+            logger.error(f"Error reading signals for {coin}: {e}")
+            return None
 
 
 async def main():
@@ -13,23 +13,34 @@ Improvements over original:
 import asyncio
 import hashlib
 import logging
+import mmap
+import os
 import pickle
 import signal
+import struct
 import time
-from collections import deque
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Deque, Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 import numpy as np
+import requests
 from kucoin.client import Market
 
+from _jit import extract_changes, row_distances, top_k_predict
 from config import Settings, TimeFrame, get_settings
-from models import Candle, Pattern
+from models import CandleArray, Pattern
 
 logger = logging.getLogger(__name__)
 
+# Pattern files: magic, then a pickle whose arrays are stored out of band
+# in aligned blocks after it, so loading can map them instead of reading
+_MODEL_MAGIC = b'PTMEM03\n'
+_ALIGN = 64
+
 
 @dataclass
 class TrainingState:
@@ -59,7 +70,32 @@ class TrainingState:
 
 
 class PatternMemory:
-    """Efficient pattern storage with LRU caching."""
+    """Efficient pattern storage with LRU caching.
+    
+    Patterns are stored column-wise: row ``i`` of every array belongs to
+    the pattern whose hash is ``hashes[i]``. Change vectors live in 2-D
+    float32 matrices so similarity search is a single vectorized sweep.
+    Close changes are also kept quantized to int8 (``close_q``) for a
+    cheap first pass over every row.
+    """
+    
+    # int8 steps per 1% change: 0.1% resolution, saturating at +/-12.7%
+    QUANT_SCALE = 10.0
+    
+    # Rows per block of the coarse similarity pass
+    SCAN_BLOCK_ROWS = 256
+    
+    # Per-pattern scalar columns and their dtypes
+    _SCALAR_COLUMNS = (
+        ('weight', np.float64),
+        ('high_weight', np.float64),
+        ('low_weight', np.float64),
+        ('hit_count', np.int64),
+        ('success_count', np.int64),
+        ('created_at', np.float64),  # epoch seconds
+        ('last_seen', np.float64),   # epoch seconds
+    )
+    _VECTOR_COLUMNS = ('close_changes', 'high_changes', 'low_changes')
     
     def __init__(self, max_size: int = 10000):
         """Initialize pattern memory.
@@ -68,9 +104,97 @@ class PatternMemory:
             max_size: Maximum number of patterns to keep
         """
         self.max_size = max_size
-        self.patterns: Dict[str, Pattern] = {}
-        self.access_queue: Deque[str] = deque(maxlen=max_size)
+        self._reset()
+    
+    def _reset(self) -> None:
+        """Drop all stored patterns."""
+        self.pattern_length = 0  # Set by the first pattern stored
+        self.n = 0
+        self.hashes: List[int] = []
+        self.index: Dict[int, int] = {}
+        # Hashes in least- to most-recently-used order
+        self.access_queue: OrderedDict[int, None] = OrderedDict()
         self._dirty = False
+        self._allocate(0, 0)
+    
+    def __len__(self) -> int:
+        """Number of stored patterns."""
+        return self.n
+    
+    def __contains__(self, pattern_hash: int) -> bool:
+        """Whether a pattern with this hash is stored."""
+        return pattern_hash in self.index
+    
+    def _allocate(self, capacity: int, length: int) -> None:
+        """Allocate empty column arrays.
+        
+        Args:
+            capacity: Number of rows
+            length: Change-vector length
+        """
+        for name, dtype in self._SCALAR_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        for name in self._VECTOR_COLUMNS:
+            setattr(self, name, np.zeros((capacity, length), dtype=np.float32))
+        self.close_q = np.zeros((capacity, length), dtype=np.int8)
+    
+    def _grow(self) -> None:
+        """Double row capacity (up to ``max_size``), keeping stored rows."""
+        n = self.n
+        capacity = min(self.max_size, max(64, 2 * len(self.weight)))
+        
+        for name, dtype in self._SCALAR_COLUMNS:
+            new = np.zeros(capacity, dtype=dtype)
+            new[:n] = getattr(self, name)[:n]
+            setattr(self, name, new)
+        for name in self._VECTOR_COLUMNS:
+            new = np.zeros((capacity, self.pattern_length), dtype=np.float32)
+            new[:n] = getattr(self, name)[:n]
+            setattr(self, name, new)
+        
+        close_q = np.zeros((capacity, self.pattern_length), dtype=np.int8)
+        close_q[:n] = self.close_q[:n]
+        self.close_q = close_q
+    
+    @staticmethod
+    def hash_changes(changes: Sequence[float]) -> int:
+        """Compute the hash a pattern is stored under.
+        
+        Args:
+            changes: Close change vector
+            
+        Returns:
+            64-bit pattern hash
+        """
+        # Round to 2 decimals (as hundredths) to group similar patterns
+        packed = np.rint(np.asarray(changes, dtype=np.float64) * 100).astype(np.int32)
+        digest = hashlib.blake2b(packed.tobytes(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+    
+    @classmethod
+    def _quantize(cls, values: np.ndarray) -> np.ndarray:
+        """Quantize percentage changes to int8 steps of ``1 / QUANT_SCALE``."""
+        scaled = np.rint(np.asarray(values, dtype=np.float64) * cls.QUANT_SCALE)
+        return np.clip(scaled, -127, 127).astype(np.int8)
+    
+    def touch(self, row: int, timestamp: float) -> None:
+        """Record another sighting of a stored pattern.
+        
+        Args:
+            row: Row of the pattern
+            timestamp: Time of the sighting (epoch seconds)
+        """
+        self.hit_count[row] += 1
+        self.last_seen[row] = timestamp
+        self._mark_used(self.hashes[row])
+    
+    def _mark_used(self, pattern_hash: int) -> None:
+        """Move a pattern to the most-recently-used end of the LRU queue."""
+        if pattern_hash in self.access_queue:
+            self.access_queue.move_to_end(pattern_hash)
+        else:
+            self.access_queue[pattern_hash] = None
+        self._dirty = True
     
     def add_pattern(self, pattern: Pattern) -> None:
         """Add or update a pattern.
@@ -78,87 +202,288 @@ class PatternMemory:
         Args:
             pattern: Pattern to store
         """
-        pattern_hash = pattern.pattern_hash
+        row = self.add_row(
+            pattern.pattern_hash,
+            pattern.close_changes,
+            pattern.high_changes,
+            pattern.low_changes,
+            pattern.created_at.timestamp()
+        )
+        if row is None:
+            return
+        
+        self.weight[row] = pattern.weight
+        self.high_weight[row] = pattern.high_weight
+        self.low_weight[row] = pattern.low_weight
+        self.hit_count[row] = pattern.hit_count
+        self.success_count[row] = pattern.success_count
+        self.last_seen[row] = pattern.last_seen.timestamp()
+    
+    def add_row(
+        self,
+        pattern_hash: int,
+        close_changes: Sequence[float],
+        high_changes: Sequence[float],
+        low_changes: Sequence[float],
+        timestamp: float
+    ) -> Optional[int]:
+        """Store a new pattern's columns directly, without a Pattern model.
         
+        A pattern already stored under this hash is touched instead.
+        
+        Args:
+            pattern_hash: Pattern hash
+            close_changes: Close change vector
+            high_changes: High change vector
+            low_changes: Low change vector
+            timestamp: Time of this sighting (epoch seconds), which is the
+                creation time of a new pattern
+            
+        Returns:
+            Row the new pattern was written to, or None if it was already
+            stored or had the wrong length
+        """
         # Update existing or add new
-        if pattern_hash in self.patterns:
-            existing = self.patterns[pattern_hash]
-            existing.hit_count += 1
-            existing.last_seen = datetime.now()
+        row = self.index.get(pattern_hash)
+        if row is not None:
+            self.touch(row, timestamp)
+            return None
+        
+        length = len(close_changes)
+        if not self.pattern_length:
+            self.pattern_length = length
+            self._allocate(0, length)
+        elif length != self.pattern_length:
+            logger.warning(
+                f"Skipping pattern of length {length} "
+                f"(memory holds length {self.pattern_length})"
+            )
+            return None
+        
+        if self.n < self.max_size:
+            if self.n == len(self.weight):
+                self._grow()
+            row = self.n
+            self.n += 1
+            self.hashes.append(pattern_hash)
         else:
-            # Evict oldest if at capacity
-            if len(self.patterns) >= self.max_size:
-                oldest = self.access_queue[0]
-                del self.patterns[oldest]
+            # Evict oldest and reuse its row
+            oldest, _ = self.access_queue.popitem(last=False)
+            row = self.index.pop(oldest)
+            self.hashes[row] = pattern_hash
+        
+        self.index[pattern_hash] = row
+        self.close_changes[row] = close_changes
+        self.close_q[row] = self._quantize(close_changes)
+        self.high_changes[row] = high_changes
+        self.low_changes[row] = low_changes
+        self.weight[row] = 1.0
+        self.high_weight[row] = 1.0
+        self.low_weight[row] = 1.0
+        self.hit_count[row] = 0
+        self.success_count[row] = 0
+        self.created_at[row] = timestamp
+        self.last_seen[row] = timestamp
+        
+        self._mark_used(pattern_hash)
+        return row
+    
+    def get_pattern(self, row: int) -> Pattern:
+        """Materialize a stored row as a Pattern model.
+        
+        Args:
+            row: Row of the pattern
             
-            self.patterns[pattern_hash] = pattern
+        Returns:
+            Pattern built from the row's columns
+        """
+        return Pattern(
+            timeframe='',
+            pattern_hash=self.hashes[row],
+            close_changes=self.close_changes[row].tolist(),
+            high_changes=self.high_changes[row].tolist(),
+            low_changes=self.low_changes[row].tolist(),
+            weight=float(self.weight[row]),
+            high_weight=float(self.high_weight[row]),
+            low_weight=float(self.low_weight[row]),
+            created_at=datetime.fromtimestamp(self.created_at[row]),
+            last_seen=datetime.fromtimestamp(self.last_seen[row]),
+            hit_count=int(self.hit_count[row]),
+            success_count=int(self.success_count[row]),
+        )
+    
+    def prediction_table(self) -> np.ndarray:
+        """Fold the per-row terms of the signal-time weighting into one table.
         
-        # Update access tracking (LRU)
-        if pattern_hash in self.access_queue:
-            self.access_queue.remove(pattern_hash)
-        self.access_queue.append(pattern_hash)
+        For a read-only memory the success-rate factor and the first
+        next-candle changes never change, so they are computed once here
+        instead of on every prediction.
         
-        self._dirty = True
+        Returns:
+            (rows, 4) float64 array of [base_weight, next_close, next_high,
+            next_low], where base_weight = weight * (1 + success_rate)
+        """
+        n = self.n
+        table = np.empty((n, 4), dtype=np.float64)
+        success_rate = self.success_count[:n] / np.maximum(1, self.hit_count[:n])
+        table[:, 0] = self.weight[:n] * (1.0 + success_rate)
+        if n:
+            table[:, 1] = self.close_changes[:n, 0]
+            table[:, 2] = self.high_changes[:n, 0]
+            table[:, 3] = self.low_changes[:n, 0]
+        return table
     
     def find_similar(
         self,
-        pattern: List[float],
-        tolerance: float = 0.25
-    ) -> List[Tuple[Pattern, float]]:
+        pattern: Sequence[float],
+        tolerance: float = 0.25,
+        top_k: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Find patterns similar to the given pattern.
         
+        Distance is the RMS of each element's percentage difference from
+        the query (elements where the query is 0 contribute nothing).
+        
         Args:
-            pattern: Price change pattern to match
+            pattern: Price change pattern to match (list or 1-D array)
             tolerance: Maximum percentage difference to consider similar
+            top_k: If set, only the first top_k matches are sorted; the
+                rest follow in no particular order
             
         Returns:
-            List of (pattern, distance) tuples sorted by similarity
+            Tuple of (distances, rows) for every match, sorted by distance
+            (most similar first)
         """
-        matches: List[Tuple[Pattern, float]] = []
+        query = np.asarray(pattern, dtype=np.float64)
+        length = self.pattern_length
         
-        for stored in self.patterns.values():
-            if len(stored.close_changes) != len(pattern):
-                continue
-            
-            # Calculate weighted Euclidean distance
-            distance = 0.0
-            for i, (stored_val, pattern_val) in enumerate(zip(stored.close_changes, pattern)):
-                diff = abs(stored_val - pattern_val)
-                pct_diff = (diff / abs(pattern_val) * 100) if pattern_val != 0 else 0.0
-                distance += pct_diff ** 2
-            
-            distance = np.sqrt(distance / len(pattern))
+        if not self.n or len(query) != length:
+            return np.empty(0), np.empty(0, dtype=np.intp)
+        
+        # Per-element scale so each diff becomes a percentage of the query
+        abs_query = np.abs(query)
+        inv_scale = np.divide(100.0, abs_query, out=np.zeros_like(abs_query), where=query != 0)
+        
+        # Coarse pass over the int8 copy. Rounding (and saturating) moves
+        # each value by at most half a step, so (|Q(s) - Q(x)| - 1) / scale
+        # never exceeds |s - x| and the result is a lower bound on every
+        # row's distance: rows above tolerance here can't match.
+        # Rows go through in blocks small enough for the scratch buffers
+        # to stay cache-resident; the query side is reused for every block
+        n = self.n
+        block = min(n, self.SCAN_BLOCK_ROWS)
+        query_q = self._quantize(query).astype(np.int16)
+        col_weights = ((inv_scale / self.QUANT_SCALE) ** 2 / length).astype(np.float32)
+        coarse = np.empty((block, length), dtype=np.int16)
+        squares = np.empty((block, length), dtype=np.float32)
+        lower_bound = np.empty(n, dtype=np.float32)
+        
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            c = coarse[:stop - start]
+            sq = squares[:stop - start]
+            np.subtract(self.close_q[start:stop], query_q, out=c)
+            np.abs(c, out=c)
+            np.subtract(c, 1, out=c)
+            np.maximum(c, 0, out=c)
+            np.square(c, out=sq, dtype=np.float32)
+            np.matmul(sq, col_weights, out=lower_bound[start:stop])
+        np.sqrt(lower_bound, out=lower_bound)
+        
+        # Small slack absorbs float32 rounding in the bound
+        candidates = np.flatnonzero(lower_bound <= tolerance * (1 + 1e-5))
+        
+        # Exact distances for the survivors only
+        pct_diff = np.abs(self.close_changes[candidates] - query) * inv_scale
+        distances = np.sqrt(np.mean(pct_diff ** 2, axis=1))
+        
+        matched = distances <= tolerance
+        rows = candidates[matched]
+        distances = distances[matched]
+        
+        if top_k is not None and 0 < top_k < len(rows):
+            # Quickselect the top_k, then sort just those (ties by row)
+            order = np.argpartition(distances, top_k - 1)
+            head = order[:top_k]
+            order[:top_k] = head[np.lexsort((rows[head], distances[head]))]
+        else:
+            order = np.argsort(distances, kind='stable')
+        return distances[order], rows[order]
+    
+    def predict(
+        self,
+        pattern: np.ndarray,
+        tolerance: float = 0.25,
+        top_k: int = 10
+    ) -> Tuple[float, np.ndarray]:
+        """Predict the next close change from the most similar patterns.
+        
+        One fused pass of ``find_similar`` and the weighted average over
+        its first top_k matches.
+        
+        Args:
+            pattern: Close change pattern to match
+            tolerance: Maximum percentage difference to consider similar
+            top_k: Number of matches to average over
             
-            if distance <= tolerance:
-                matches.append((stored, distance))
+        Returns:
+            Tuple of (predicted_change, rows) with the top_k matched rows,
+            most similar first
+        """
+        query = np.asarray(pattern, dtype=np.float64)
+        if not self.n or len(query) != self.pattern_length:
+            return 0.0, np.empty(0, dtype=np.int64)
+        
+        abs_query = np.abs(query)
+        inv_scale = np.divide(100.0, abs_query, out=np.zeros_like(abs_query), where=query != 0)
         
-        # Sort by distance (most similar first)
-        matches.sort(key=lambda x: x[1])
-        return matches
+        changes = self.close_changes[:self.n]
+        totals = row_distances(changes, query, inv_scale, tolerance)
+        return top_k_predict(changes, self.weight[:self.n], totals, tolerance, top_k)
     
     def save(self, path: Path) -> None:
         """Save patterns to disk.
         
+        Does nothing if nothing changed since the last save or load. The
+        file is written beside the target and renamed over it, so an
+        interrupted save never leaves a truncated model.
+        
         Args:
             path: File path to save to
         """
         if not self._dirty:
             return
         
+        n = self.n
+        data = {
+            'version': 3,
+            'hashes': self.hashes[:n],
+            'access_queue': list(self.access_queue),
+            'close_q': self.close_q[:n],
+        }
+        for name, _ in self._SCALAR_COLUMNS:
+            data[name] = getattr(self, name)[:n]
+        for name in self._VECTOR_COLUMNS:
+            data[name] = getattr(self, name)[:n]
+        
+        tmp_path = path.with_name(path.name + '.tmp')
         try:
-            with open(path, 'wb') as f:
-                pickle.dump({
-                    'patterns': self.patterns,
-                    'access_queue': list(self.access_queue),
-                }, f)
+            with open(tmp_path, 'wb') as f:
+                self._dump(data, f)
+            os.replace(tmp_path, path)
             self._dirty = False
-            logger.debug(f"Saved {len(self.patterns)} patterns to {path}")
+            logger.debug(f"Saved {n} patterns to {path}")
         except Exception as e:
             logger.error(f"Failed to save patterns: {e}")
     
     def load(self, path: Path) -> None:
         """Load patterns from disk.
         
+        Reads both the columnar format and the older dict-of-Pattern
+        format, which is converted on load. Columns of current files are
+        memory-mapped copy-on-write rather than read in, so pages load on
+        first touch and writes stay private to this process.
+        
         Args:
             path: File path to load from
         """
@@ -167,21 +492,168 @@ class PatternMemory:
             return
         
         try:
-            with open(path, 'rb') as f:
-                data = pickle.load(f)
+            data = self._read(path)
+            
+            if data.get('version', 1) >= 2:
+                self._load_columns(data)
+            else:
+                self._load_patterns(data)
             
-            self.patterns = data.get('patterns', {})
-            self.access_queue = deque(data.get('access_queue', []), maxlen=self.max_size)
             self._dirty = False
             
-            logger.info(f"Loaded {len(self.patterns)} patterns from {path}")
+            logger.info(f"Loaded {self.n} patterns from {path}")
         except Exception as e:
             logger.error(f"Failed to load patterns: {e}")
+    
+    @staticmethod
+    def _dump(data: Dict, f) -> None:
+        """Write ``data`` with its array buffers out of band.
+        
+        Layout: magic, pickle length and buffer count (uint64 each), each
+        buffer's length, the pickle, then every buffer starting on an
+        ``_ALIGN``-byte boundary.
+        """
+        buffers: List[pickle.PickleBuffer] = []
+        meta = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        
+        f.write(_MODEL_MAGIC)
+        f.write(struct.pack(f'<{2 + len(raws)}Q', len(meta), len(raws), *(raw.nbytes for raw in raws)))
+        f.write(meta)
+        for raw in raws:
+            f.write(b'\0' * (-f.tell() % _ALIGN))
+            f.write(raw)
+    
+    @staticmethod
+    def _read(path: Path) -> Dict:
+        """Read a file written by ``_dump``, or a plain pickle.
+        
+        Arrays come back as copy-on-write views of a private mapping.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(_MODEL_MAGIC)) != _MODEL_MAGIC:
+                f.seek(0)
+                return pickle.load(f)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        
+        view = memoryview(mapped)
+        offset = len(_MODEL_MAGIC)
+        meta_len, count = struct.unpack_from('<2Q', mapped, offset)
+        offset += 16
+        sizes = struct.unpack_from(f'<{count}Q', mapped, offset)
+        offset += 8 * count
+        meta = view[offset:offset + meta_len]
+        offset += meta_len
+        
+        buffers = []
+        for size in sizes:
+            offset += -offset % _ALIGN
+            buffers.append(view[offset:offset + size])
+            offset += size
+        return pickle.loads(meta, buffers=buffers)
+    
+    def _load_columns(self, data: Dict) -> None:
+        """Restore state saved in the columnar format.
+        
+        A file with more than ``max_size`` rows keeps its most recently
+        used ones, the same rows eviction would have kept. Hex-string
+        hashes from older saves are recomputed from the rows' close
+        changes, keeping one row per resulting hash.
+        """
+        renamed: Dict[str, int] = {}
+        hashes = []
+        for row, pattern_hash in enumerate(data['hashes']):
+            if isinstance(pattern_hash, str):
+                renamed[pattern_hash] = self.hash_changes(data['close_changes'][row])
+                pattern_hash = renamed[pattern_hash]
+            hashes.append(pattern_hash)
+        saved_queue = [renamed.get(h, h) for h in data.get('access_queue', [])]
+        total = len(hashes)
+        
+        if total > self.max_size or len(set(hashes)) < total:
+            rows = self._most_recent_rows(hashes, saved_queue)
+            hashes = [hashes[row] for row in rows]
+        else:
+            rows = slice(None)
+        
+        self.n = len(hashes)
+        self.hashes = hashes
+        self.index = {h: i for i, h in enumerate(hashes)}
+        self.pattern_length = data['close_changes'].shape[1] if total else 0
+        
+        # Arrays already in the stored dtypes are used as loaded (mapped
+        # for current files); _grow copies them once more rows are needed
+        for name, dtype in self._SCALAR_COLUMNS:
+            setattr(self, name, np.asarray(data[name][rows], dtype=dtype))
+        for name in self._VECTOR_COLUMNS:
+            setattr(self, name, np.asarray(data[name][rows], dtype=np.float32))
+        if 'close_q' in data:
+            self.close_q = np.asarray(data['close_q'][rows], dtype=np.int8)
+        else:
+            self.close_q = self._quantize(self.close_changes)
+        
+        self._restore_access_queue(saved_queue)
+    
+    def _most_recent_rows(self, hashes: List[int], saved_queue: List[int]) -> np.ndarray:
+        """Pick the ``max_size`` most recently used rows of a saved file.
+        
+        Args:
+            hashes: Hash of each saved row
+            saved_queue: Saved LRU queue, least recently used first
+            
+        Returns:
+            Indices of the rows to keep (the last row of any repeated
+            hash), in file order
+        """
+        position = {h: row for row, h in enumerate(hashes)}
+        queued = [h for h in dict.fromkeys(saved_queue) if h in position]
+        seen = set(queued)
+        
+        # Rows missing from the queue count as least recently used, as in
+        # _restore_access_queue
+        order = [row for h, row in position.items() if h not in seen]
+        order.extend(position[h] for h in queued)
+        return np.sort(np.array(order[-self.max_size:], dtype=np.intp))
+    
+    def _load_patterns(self, data: Dict) -> None:
+        """Convert state saved as a dict of Pattern models."""
+        patterns: Dict[str, Pattern] = data.get('patterns', {})
+        renamed: Dict[str, int] = {}
+        for pattern in patterns.values():
+            if isinstance(pattern.pattern_hash, str):
+                renamed[pattern.pattern_hash] = self.hash_changes(pattern.close_changes)
+                pattern.pattern_hash = renamed[pattern.pattern_hash]
+        saved_queue = [renamed.get(h, h) for h in data.get('access_queue', [])]
+        self._reset()
+        
+        # Least recently used first, so past max_size eviction drops those
+        rank = {h: i for i, h in enumerate(saved_queue)}
+        for pattern in sorted(patterns.values(), key=lambda p: rank.get(p.pattern_hash, -1)):
+            self.add_pattern(pattern)
+        
+        self._restore_access_queue(saved_queue)
+    
+    def _restore_access_queue(self, saved: List[int]) -> None:
+        """Rebuild LRU order from a saved queue.
+        
+        Stored patterns missing from the saved queue are treated as least
+        recently used so every row stays evictable.
+        """
+        queued = [h for h in saved if h in self.index]
+        seen = set(queued)
+        missing = [h for h in self.hashes if h not in seen]
+        self.access_queue = OrderedDict.fromkeys(missing + queued)
 
 
 class NeuralTrainer:
     """Enhanced neural network trainer for crypto patterns."""
     
+    # Most kline requests in flight at once
+    FETCH_CONCURRENCY = 10
+    
+    # Sightings after which an exact hash match predicts on its own
+    EXACT_MATCH_MIN_HITS = 3
+    
     def __init__(
         self,
         settings: Optional[Settings] = None,
@@ -196,10 +668,27 @@ class NeuralTrainer:
         self.settings = settings or get_settings()
         self.market = market_client or Market(url='https://api.kucoin.com')
         
+        # Concurrent kline requests share one keep-alive session; size its
+        # connection pool so parallel fetches don't discard connections
+        if getattr(self.market, 'session', False) is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.FETCH_CONCURRENCY)
+            session.mount('https://', adapter)
+            self.market.session = session
+        
         self.memories: Dict[str, PatternMemory] = {}
         self.states: Dict[str, TrainingState] = {}
         self.should_stop = False
         
+        # Candles fetched ahead of training by (coin, timeframe, limit)
+        self._prefetched: Dict[Tuple[str, str, int], Optional[CandleArray]] = {}
+        
+        # Timeframes train in parallel on these threads; the numeric
+        # kernels release the GIL
+        self._pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count(), thread_name_prefix="train"
+        )
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._handle_signal)
         signal.signal(signal.SIGTERM, self._handle_signal)
@@ -214,26 +703,23 @@ class NeuralTrainer:
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.should_stop = True
     
-    def _compute_pattern_hash(self, changes: List[float]) -> str:
+    def _compute_pattern_hash(self, changes: Sequence[float]) -> int:
         """Compute unique hash for a pattern.
         
         Args:
             changes: Price change sequence
             
         Returns:
-            Pattern hash string
+            64-bit pattern hash
         """
-        # Round to 2 decimals to group similar patterns
-        rounded = [round(c, 2) for c in changes]
-        pattern_str = '|'.join(str(c) for c in rounded)
-        return hashlib.sha256(pattern_str.encode()).hexdigest()[:16]
+        return PatternMemory.hash_changes(changes)
     
     def _fetch_candles(
         self,
         symbol: str,
         timeframe: str,
         limit: int = 1500
-    ) -> List[Candle]:
+    ) -> Optional[CandleArray]:
         """Fetch historical candle data.
         
         Args:
@@ -242,111 +728,147 @@ class NeuralTrainer:
             limit: Number of candles to fetch
             
         Returns:
-            List of candles, newest first
+            Candle columns, newest first, or None if the fetch failed
         """
         try:
             data = self.market.get_kline(symbol, timeframe, limit=limit)
+            candles = CandleArray.from_klines(data)
             
-            candles = []
-            for row in data:
-                candles.append(Candle(
-                    timestamp=datetime.fromtimestamp(int(row[0])),
-                    open=float(row[1]),
-                    close=float(row[2]),
-                    high=float(row[3]),
-                    low=float(row[4]),
-                    volume=float(row[5]),
-                ))
-            
-            # Return newest first (reverse chronological)
-            candles.reverse()
-            return candles
+            # Return newest first (reverse chronological), each column
+            # contiguous for the kernels
+            return CandleArray(*(np.ascontiguousarray(column[::-1]) for column in candles))
             
         except Exception as e:
             logger.error(f"Failed to fetch candles for {symbol} {timeframe}: {e}")
-            return []
+            return None
+    
+    def _candle_limit(self, num_candles: int) -> int:
+        """Number of candles to fetch for a training run.
+        
+        Args:
+            num_candles: Number of candle windows to train on
+            
+        Returns:
+            Candle count, with 100 extra for the oldest windows' history
+        """
+        return num_candles + 100
+    
+    async def _prefetch_candles(
+        self,
+        coins: Sequence[str],
+        timeframes: Sequence[str],
+        limit: int
+    ) -> None:
+        """Fetch candles for every coin and timeframe concurrently.
+        
+        Results wait in ``_prefetched`` for ``train_timeframe``; at most
+        FETCH_CONCURRENCY requests run at once.
+        
+        Args:
+            coins: Coin symbols
+            timeframes: Candle timeframes
+            limit: Number of candles per fetch
+        """
+        semaphore = asyncio.Semaphore(self.FETCH_CONCURRENCY)
+        
+        async def fetch(coin: str, timeframe: str) -> None:
+            async with semaphore:
+                candles = await asyncio.to_thread(
+                    self._fetch_candles, f"{coin}-USDT", timeframe, limit
+                )
+            if candles is not None:
+                self._prefetched[(coin, timeframe, limit)] = candles
+        
+        await asyncio.gather(
+            *[fetch(coin, timeframe) for coin in coins for timeframe in timeframes]
+        )
     
     def _extract_pattern(
         self,
-        candles: List[Candle],
+        prices: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        start: int,
         lookback: int
-    ) -> Tuple[List[float], List[float], List[float]]:
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Extract price change pattern from candles.
         
         Args:
-            candles: List of candles (newest first)
+            prices: (close, high, low) price arrays, newest first
+            start: Index of the pattern's newest candle
             lookback: Number of candles to use for pattern
             
         Returns:
-            Tuple of (close_changes, high_changes, low_changes)
+            Tuple of (close_changes, high_changes, low_changes), empty if
+            the arrays end before the window does
         """
-        if len(candles) < lookback + 1:
-            return [], [], []
-        
-        close_changes = []
-        high_changes = []
-        low_changes = []
-        
-        for i in range(lookback):
-            curr = candles[i]
-            prev = candles[i + 1]
-            
-            close_change = ((curr.close - prev.close) / prev.close) * 100
-            high_change = ((curr.high - prev.high) / prev.high) * 100
-            low_change = ((curr.low - prev.low) / prev.low) * 100
-            
-            close_changes.append(close_change)
-            high_changes.append(high_change)
-            low_changes.append(low_change)
+        close, high, low = prices
+        if len(close) < start + lookback + 1:
+            empty = np.empty(0)
+            return empty, empty, empty
         
-        return close_changes, high_changes, low_changes
+        return extract_changes(close, high, low, start, lookback)
     
     def _update_weights(
         self,
-        pattern: Pattern,
+        memory: PatternMemory,
+        rows: np.ndarray,
         actual_change: float,
         predicted_change: float,
         learning_rate: float = 0.25
-    ) -> Pattern:
+    ) -> None:
         """Update pattern weights based on prediction accuracy.
         
         Args:
-            pattern: Pattern to update
+            memory: Memory holding the patterns
+            rows: Rows of the patterns that made the prediction
             actual_change: Actual price change observed
             predicted_change: Predicted price change
             learning_rate: Weight adjustment rate
-            
-        Returns:
-            Updated pattern
         """
         # Calculate prediction error
         error_pct = abs((actual_change - predicted_change) / actual_change * 100) if actual_change != 0 else 0.0
         
-        # Adjust weight based on accuracy
+        # Adjust weights based on accuracy; every row shared the prediction
         if error_pct < 10:  # Good prediction
-            pattern.weight = min(2.0, pattern.weight + learning_rate)
-            pattern.success_count += 1
+            memory.weight[rows] = np.minimum(memory.weight[rows] + learning_rate, 2.0)
+            memory.success_count[rows] += 1
         elif error_pct > 25:  # Poor prediction
-            pattern.weight = max(-2.0, pattern.weight - learning_rate)
-        
-        return pattern
+            memory.weight[rows] = np.maximum(memory.weight[rows] - learning_rate, -2.0)
     
     async def train_timeframe(
         self,
         coin: str,
         timeframe: str,
-        num_candles: int = 500
+        num_candles: Optional[int] = None
     ) -> TrainingState:
         """Train model on a specific timeframe.
         
+        The fetch and the training loop run on the trainer's thread pool,
+        so concurrent calls train in parallel.
+        
         Args:
             coin: Coin symbol
             timeframe: Timeframe to train
             num_candles: Number of historical candles to process
+                (default: model.training_candles)
             
         Returns:
             Training state with statistics
         """
+        if num_candles is None:
+            num_candles = self.settings.model.training_candles
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, self._train_timeframe, coin, timeframe, num_candles
+        )
+    
+    def _train_timeframe(
+        self,
+        coin: str,
+        timeframe: str,
+        num_candles: int
+    ) -> TrainingState:
+        """Blocking body of ``train_timeframe``."""
         state = TrainingState(coin=coin, timeframe=timeframe)
         state.is_training = True
         self.states[f"{coin}_{timeframe}"] = state
@@ -365,79 +887,74 @@ class NeuralTrainer:
         
         try:
             # Fetch historical data
-            symbol = f"{coin}-USDT"
-            candles = self._fetch_candles(symbol, timeframe, limit=num_candles + 100)
+            limit = self._candle_limit(num_candles)
+            candles = self._prefetched.pop((coin, timeframe, limit), None)
+            if candles is None:
+                candles = self._fetch_candles(f"{coin}-USDT", timeframe, limit=limit)
             
-            if not candles:
+            if candles is None or not len(candles.close):
                 logger.warning(f"No candles fetched for {coin} {timeframe}")
                 state.is_training = False
                 return state
             
             lookback = self.settings.model.lookback_candles
             
+            # Price columns, newest first, so windows are index ranges
+            prices = (candles.close, candles.high, candles.low)
+            close = candles.close
+            
             # Process each candle window
             for i in range(num_candles):
                 if self.should_stop:
                     logger.info("Training interrupted")
                     break
                 
+                # One clock read covers every timestamp this step writes
+                now_ts = time.time()
+                
                 # Extract pattern from historical window
-                pattern_candles = candles[i:i + lookback + 2]
-                if len(pattern_candles) < lookback + 2:
+                if len(close) < i + lookback + 2:
                     continue
                 
                 close_changes, high_changes, low_changes = self._extract_pattern(
-                    pattern_candles[:-1],  # Current pattern
-                    lookback
+                    prices, i, lookback
                 )
                 
-                if not close_changes:
+                if not len(close_changes):
                     continue
                 
-                # Future candle (what we're predicting)
-                future = pattern_candles[0]
-                current = pattern_candles[1]
-                actual_change = ((future.close - current.close) / current.close) * 100
+                # Future candle (what we're predicting) against the current one
+                actual_change = ((close[i] - close[i + 1]) / close[i + 1]) * 100
                 
-                # Create pattern
                 pattern_hash = self._compute_pattern_hash(close_changes)
-                pattern = Pattern(
-                    timeframe=timeframe,
-                    pattern_hash=pattern_hash,
-                    close_changes=close_changes,
-                    high_changes=high_changes,
-                    low_changes=low_changes,
-                    created_at=datetime.now(),
-                    last_seen=datetime.now(),
-                )
                 
-                # Find similar patterns and predict
-                similar = memory.find_similar(
-                    close_changes,
-                    tolerance=self.settings.model.distance_tolerance_pct
-                )
+                # A pattern seen often enough predicts from its own history,
+                # skipping the similarity scan
+                row = memory.index.get(pattern_hash)
+                if row is not None and memory.hit_count[row] >= self.EXACT_MATCH_MIN_HITS:
+                    predicted_change = float(memory.close_changes[row, 0])
+                    rows = np.array([row], dtype=np.int64)
+                else:
+                    # Weighted prediction from the 10 most similar patterns;
+                    # weight decays with distance
+                    predicted_change, rows = memory.predict(
+                        close_changes,
+                        tolerance=self.settings.model.distance_tolerance_pct,
+                        top_k=10
+                    )
                 
-                if similar:
-                    # Weight average prediction from similar patterns
-                    weighted_sum = 0.0
-                    weight_sum = 0.0
-                    
-                    for sim_pattern, distance in similar[:10]:  # Top 10 matches
-                        # Weight decays with distance
-                        weight = sim_pattern.weight * (1.0 / (1.0 + distance))
-                        weighted_sum += sim_pattern.close_changes[0] * weight
-                        weight_sum += weight
-                    
-                    predicted_change = weighted_sum / weight_sum if weight_sum > 0 else 0.0
-                    
-                    # Update weights of similar patterns
-                    for sim_pattern, _ in similar[:5]:
-                        updated = self._update_weights(sim_pattern, actual_change, predicted_change)
-                        memory.add_pattern(updated)
-                        state.patterns_updated += 1
+                if len(rows):
+                    # Update weights of the (up to) 5 patterns that predicted
+                    top = rows[:5]
+                    self._update_weights(memory, top, actual_change, predicted_change)
+                    for row in top:
+                        memory.touch(row, now_ts)
+                    state.patterns_updated += len(top)
                 
                 # Add this pattern to memory
-                memory.add_pattern(pattern)
+                memory.add_row(
+                    pattern_hash, close_changes, high_changes, low_changes, now_ts
+                )
                 state.patterns_learned += 1
                 state.candles_processed += 1
                 
@@ -449,13 +966,9 @@ class NeuralTrainer:
                     logger.info(
                         f"Checkpoint: {coin} {timeframe} - "
                         f"{state.candles_processed} candles, "
-                        f"{len(memory.patterns)} patterns, "
+                        f"{len(memory)} patterns, "
                         f"{state.candles_per_second:.1f} candles/sec"
                     )
-                
-                # Small delay to prevent CPU overload
-                if i % 50 == 0:
-                    await asyncio.sleep(0.01)
             
             # Final save
             model_path = self.settings.get_model_path(coin, timeframe)
@@ -464,7 +977,9 @@ class NeuralTrainer:
             # Update state
             state.completed_at = datetime.now()
             state.is_training = False
-            state.success_rate = memory.patterns[list(memory.patterns.keys())[0]].success_count / max(1, memory.patterns[list(memory.patterns.keys())[0]].hit_count) if memory.patterns else 0.0
+            # Share of all recorded sightings that predicted well
+            n = len(memory)
+            state.success_rate = float(memory.success_count[:n].sum() / max(1, memory.hit_count[:n].sum()))
             
             # Write training completion timestamp
             timestamp_file = self.settings.get_coin_dir(coin) / "trainer_last_training_time.txt"
@@ -474,7 +989,7 @@ class NeuralTrainer:
                 f"Training completed: {coin} {timeframe} - "
                 f"{state.duration_seconds:.1f}s, "
                 f"{state.candles_processed} candles, "
-                f"{len(memory.patterns)} total patterns"
+                f"{len(memory)} total patterns"
             )
             
         except Exception as e:
@@ -492,16 +1007,16 @@ class NeuralTrainer:
         Returns:
             Dictionary of training states by timeframe
         """
-        states = {}
+        if self.should_stop:
+            return {}
         
-        for timeframe in self.settings.trading.timeframes:
-            if self.should_stop:
-                break
-            
-            state = await self.train_timeframe(coin, timeframe.value)
-            states[timeframe.value] = state
+        # Timeframes are independent, so train them all at once
+        timeframes = [timeframe.value for timeframe in self.settings.trading.timeframes]
+        states = await asyncio.gather(
+            *[self.train_timeframe(coin, timeframe) for timeframe in timeframes]
+        )
         
-        return states
+        return dict(zip(timeframes, states))
     
     async def train_all(self) -> Dict[str, Dict[str, TrainingState]]:
         """Train all configured coins and timeframes.
@@ -511,7 +1026,13 @@ class NeuralTrainer:
         """
         all_states = {}
         
-        for coin in self.settings.trading.coins:
+        # Fetch every coin's candles up front, overlapping the requests
+        coins = self.settings.trading.coins
+        timeframes = [timeframe.value for timeframe in self.settings.trading.timeframes]
+        limit = self._candle_limit(self.settings.model.training_candles)
+        await self._prefetch_candles(coins, timeframes, limit=limit)
+        
+        for coin in coins:
             if self.should_stop:
                 break
             
@@ -519,6 +1040,14 @@ class NeuralTrainer:
             all_states[coin] = states
         
         return all_states
+    
+    def close(self) -> None:
+        """Shut down the training thread pool.
+        
+        Waits for any timeframe still training; the trainer can't train
+        afterwards.
+        """
+        self._pool.shutdown(wait=True)
 
 
 async def main():
@@ -532,13 +1061,16 @@ async def main():
     
     trainer = NeuralTrainer()
     
-    if len(sys.argv) > 1:
-        # Train specific coin
-        coin = sys.argv[1].upper()
-        await trainer.train_coin(coin)
-    else:
-        # Train all coins
-        await trainer.train_all()
+    try:
+        if len(sys.argv) > 1:
+            # Train specific coin
+            coin = sys.argv[1].upper()
+            await trainer.train_coin(coin)
+        else:
+            # Train all coins
+            await trainer.train_all()
+    finally:
+        trainer.close()
 
 
 if __name__ == "__main__":